@@ -36,6 +36,11 @@ class GlobalCoordinator:
         self._fetch_paused = False
         self._process_paused = False
         self._last_state_change = datetime.utcnow()
+        # Set whenever state is not PROCESSING, so the fetcher can block on it
+        self.idle_event = threading.Event()
+        self.idle_event.set()
+        # Set on every transition into PROCESSING, so the worker can wake early
+        self.work_event = threading.Event()
         
         logger.info("==============================================")
         logger.info("🎯 Global Coordinator initialized")
@@ -55,14 +60,23 @@ class GlobalCoordinator:
                 raise ValueError(f"Invalid state: {new_state}")
             
             old_state = self._state
-            self._state = new_state
-            self._last_state_change = datetime.utcnow()
+            self._enter_state(new_state)
             
             if old_state != new_state:
                 logger.info("==============================================")
                 logger.info(f"🔄 State transition: {old_state} → {new_state}")
                 logger.info("==============================================")
     
+    def _enter_state(self, new_state: str) -> None:
+        """Switch state and keep idle_event/work_event in sync (caller holds the lock)"""
+        self._state = new_state
+        self._last_state_change = datetime.utcnow()
+        if new_state == self.PROCESSING:
+            self.idle_event.clear()
+            self.work_event.set()
+        else:
+            self.idle_event.set()
+    
     # ==================== Fetch Control ====================
     
     def can_fetch(self) -> bool:
@@ -89,7 +103,7 @@ class GlobalCoordinator:
     def start_fetching_source(self, source_name: str) -> None:
         """Mark start of fetching from a specific source"""
         with self._lock:
-            self._state = self.FETCHING
+            self._enter_state(self.FETCHING)
             self._current_source = source_name
             logger.info(f"📡 Fetching from: {source_name}")
     
@@ -102,9 +116,9 @@ class GlobalCoordinator:
             
             # Transition to PROCESSING if articles were fetched
             if article_count > 0:
-                self._state = self.PROCESSING
+                self._enter_state(self.PROCESSING)
             else:
-                self._state = self.IDLE
+                self._enter_state(self.IDLE)
     
     # ==================== Process Control ====================
     
@@ -162,7 +176,7 @@ class GlobalCoordinator:
             
             # If no more pending, transition to IDLE
             if self._pending_count == 0:
-                self._state = self.IDLE
+                self._enter_state(self.IDLE)
                 logger.info("==============================================")
                 logger.info("🎉 Processing complete - transitioning to IDLE")
                 logger.info("==============================================")
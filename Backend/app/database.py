@@ -44,6 +44,13 @@ def init_db(app):
             logger.info("ℹ No collections found yet — database initialized empty.")
         logger.info("===================================================")
 
+        # Article indexes/views are ensured once here, not on first store access
+        try:
+            from app.services.persistence.article_store import ArticleStore
+            ArticleStore().bootstrap(db)
+        except Exception as e:
+            logger.warning(f"⚠ Article store bootstrap failed: {e}")
+
         return db
 
     except Exception as e:
@@ -240,7 +240,9 @@ class Document:
         
         # Add embedding if present
         if context.get("embedding"):
-            update_payload["embedding"] = context["embedding"]
+            # 🔹 Lazy import
+            from app.services.persistence.article_store import embedding_vector
+            update_payload["embedding"] = embedding_vector(context["embedding"])
 
         db[collection].update_one(
             {"_id": ObjectId(doc_id)},
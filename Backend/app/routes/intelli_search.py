@@ -5,6 +5,7 @@ import numpy as np
 from app.services.intelli_search.query_processor import process_query
 from app.services.intelli_search.retriever import retrieve_candidates
 from app.services.intelli_search.reranker import rerank
+from app.services.intelli_search.vector_retriever import fetch_bodies
 from app.services.intelli_search.confidence import compute_confidence
 from app.services.intelli_search.explainer import explain_result
 
@@ -90,6 +91,11 @@ def search():
         # For broad queries, return more results
         top_k = 50 if is_broad_query else 10
         ranked_results = rerank(query_text, candidates, top_k=top_k, q_signals=q_signals)
+
+        # Vector hits carry capped summaries; restore full bodies for the survivors only
+        bodies = fetch_bodies([doc["_id"] for doc in ranked_results if doc.get("semantic_match")])
+        for doc in ranked_results:
+            doc.update(bodies.get(doc["_id"], {}))
         
         # Serialize MongoDB documents
         serialized_results = []
@@ -682,6 +682,11 @@ class PipelineEvaluator:
         try:
             embedding = article.get('embedding')
             
+            # Stored embeddings are BSON float32 vectors (see article_store.embedding_vector)
+            from bson.binary import Binary, VECTOR_SUBTYPE
+            if isinstance(embedding, Binary) and embedding.subtype == VECTOR_SUBTYPE:
+                embedding = embedding.as_vector().data
+            
             # Check if embedding exists
             has_embedding = bool(embedding) and isinstance(embedding, list) and len(embedding) > 0
             
@@ -99,6 +99,8 @@ def process_document_pipeline(db, doc_id, raw_text, stages=None, collection="doc
             "processing_path": final_context.get("processing_path"),
             "language": final_context.get("language"),
             "category": final_context.get("category"),
+            # Summary exactly as persisted above, so callers need not re-read the document
+            "stored_summary": final_context.get("summary"),
             "stats": {
                 "reduction_percentage": final_context.get("scores", {}).get("reduction_percentage", 0.0),
                 "time_taken": round(total_time / 1000, 2)
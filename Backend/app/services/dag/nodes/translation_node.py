@@ -4,6 +4,16 @@ from app.services.analysis.translation_service import translation_service
 
 logger = logging.getLogger(__name__)
 
+# Body translations keyed by (languages, mode, masked input), shared across documents
+_translation_cache = None
+
+def _get_translation_cache(db):
+    global _translation_cache
+    if _translation_cache is None and db is not None:
+        from app.services.persistence.text_cache import TextCache
+        _translation_cache = TextCache(db, "translation_cache")
+    return _translation_cache
+
 class TranslationNode(ProcessingNode):
     def __init__(self):
         super().__init__("Translation")
@@ -71,18 +81,25 @@ class TranslationNode(ProcessingNode):
         
         masked_text, entity_map = entity_mask_service.mask(text, entities)
         
-        if target_lang == "en":
-            # 🚀 Use pre-segmented sentences from Stage 1 if available
-            sentences = context.get("sentences")
-            
-            # If we have sentences, we need to mask them too
-            masked_sentences = None
-            if sentences:
-                masked_sentences = []
-                for sent in sentences:
-                    masked_sent, _ = entity_mask_service.mask(sent, entities)
-                    masked_sentences.append(masked_sent)
-            
+        # 🗃️ Translation cache: the MT input is the masked text, so a reprint with
+        # the same masked body reuses the stored translation (reinjection below
+        # still uses this document's own entity map)
+        from app.services.persistence.text_cache import text_key
+        sentences = context.get("sentences") if target_lang == "en" else None
+        masked_sentences = None
+        if sentences:
+            masked_sentences = [entity_mask_service.mask(sent, entities)[0] for sent in sentences]
+        cache = _get_translation_cache(context.get("db"))
+        cache_key = text_key(
+            "\n".join(masked_sentences) if masked_sentences else masked_text,
+            source_lang, target_lang, translation_mode, "sentences" if masked_sentences else "text"
+        )
+        result = cache.get(cache_key) if cache else None
+        
+        if result is not None:
+            logger.info(f"[{doc_id}] Translation served from cache")
+        elif target_lang == "en":
+            # 🚀 Use pre-segmented sentences from Stage 1 if available (masked above)
             result = translation_service.translate_to_english(
                 text=masked_text if not sentences else None,
                 source_language=source_lang,
@@ -97,6 +114,14 @@ class TranslationNode(ProcessingNode):
                 "translation_engine": "generic"
             }
         
+        if cache and result.get("success") and not result.get("from_cache"):
+            cache.put(cache_key, {
+                "success": True,
+                "translated_text": result["translated_text"],
+                "translation_engine": result["translation_engine"],
+                "from_cache": True
+            })
+        
         if result.get("success"):
             # 🔑 REINJECT: Replace placeholders with canonical English forms
             translated_text = result["translated_text"]
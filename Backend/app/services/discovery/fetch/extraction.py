@@ -4,21 +4,50 @@ import requests
 import trafilatura
 from bs4 import BeautifulSoup
 from newspaper import Article, Config
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+USER_AGENT = "Mozilla/5.0"
+FETCH_TIMEOUT = 10
+
+# Shared keep-alive pool: article pages and images are fetched from a handful
+# of news hosts, so TCP/TLS handshakes are amortized across requests.
+_session = requests.Session()
+_session.headers["User-Agent"] = USER_AGENT
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
+
+def _fetch_page(url: str, session=None):
+    """Page response via the pooled session, or None on error / non-200."""
+    try:
+        response = (session or _session).get(url, timeout=FETCH_TIMEOUT)
+        if response.status_code == 200:
+            return response
+    except Exception:
+        logger.warning("Article download failed")
+    return None
+
 # ---------------------------------------------------------
 # ARTICLE EXTRACTION
 # ---------------------------------------------------------
 
-def extract_article_package(url: str):
+def extract_article_package(url: str, session=None):
+    """
+    Extract article text. The page is downloaded once (pooled session) and
+    handed to trafilatura, then to newspaper as a fallback.
+    """
     if not url:
         return {"success": False}, None
 
+    page = _fetch_page(url, session)
+
     try:
-        downloaded = trafilatura.fetch_url(url)
-        if downloaded:
-            content = trafilatura.extract(downloaded)
+        if page is not None:
+            # Raw bytes: trafilatura does its own charset detection
+            content = trafilatura.extract(page.content)
             if content:
                 return {"success": True, "content": content}, url
     except Exception:
@@ -26,9 +55,12 @@ def extract_article_package(url: str):
 
     try:
         config = Config()
-        config.browser_user_agent = "Mozilla/5.0"
+        config.browser_user_agent = USER_AGENT
         article = Article(url, config=config)
-        article.download()
+        if page is not None:
+            article.download(input_html=page.text)
+        else:
+            article.download()
         article.parse()
         if article.text:
             return {"success": True, "content": article.text}, article.canonical_link or url
@@ -51,16 +83,12 @@ def is_generic_image(url: str) -> bool:
     
     return any(keyword in url_lower for keyword in generic_keywords)
 
-def extract_article_image(url: str):
+def extract_article_image(url: str, session=None):
     if not url:
         return None
 
     try:
-        response = requests.get(
-            url,
-            headers={"User-Agent": "Mozilla/5.0"},
-            timeout=10
-        )
+        response = (session or _session).get(url, timeout=FETCH_TIMEOUT)
         if response.status_code != 200:
             return None
 
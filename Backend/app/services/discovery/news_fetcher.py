@@ -5,13 +5,21 @@ Fetches news metadata from the pre-populated 'articles' collection.
 Ingestion is handled by the background RSSScheduler.
 """
 
-from app.services.persistence.article_store import ArticleStore
+from app.services.persistence.article_store import (
+    ArticleStore,
+    DISCOVERY_TIER_FIELDS,
+    discovery_index_name
+)
 from app.services.discovery.fetch.extraction import extract_article_package
 from app.services.core.pipeline_orchestrator import process_document_pipeline
 from app.services.pagination.cursor_pagination import CursorPagination
 from app.services.ranking.article_ranker import ArticleRanker
 from datetime import datetime, timedelta
 from bson import ObjectId
+from operator import itemgetter
+from pymongo import ReturnDocument
+from pymongo.errors import ExecutionTimeout, OperationFailure
+import heapq
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,13 +31,24 @@ paginator = CursorPagination(
     sort_fields=[("created_at", -1), ("_id", -1)],
     max_limit=50
 )
+keyword_paginator = CursorPagination(
+    sort_fields=[("score", -1), ("_id", -1)],
+    max_limit=50
+)
 ranker = ArticleRanker()
 
+# Server-side execution ceilings for feed queries
+DISCOVERY_MAX_TIME_MS = 2000
+KEYWORD_MAX_TIME_MS = 3000
+
 
 def build_discovery_tiers(context: dict, query_language=None):
     """
     Build ordered MongoDB query tiers based on resolved context.
     Highest priority tier comes first.
+
+    Each tier is served by a (status, <tier field>, created_at, _id) compound
+    index created in ArticleStore; the global tier uses (status, created_at).
     
     Args:
         context: Resolved context dict
@@ -121,23 +140,22 @@ def build_discovery_tiers(context: dict, query_language=None):
     return tiers
 
 
+# Fields copied verbatim from the stored article into the UI payload
+_FMT_KEYS = ("title", "original_url", "image_url", "source", "category", "published_date")
+
+
 def _format_article(doc):
     """
     Standardize article output for UI.
     Serves AI summary if analyzed, otherwise the original RSS snippet.
     """
-    analyzed = doc.get("analyzed", False)
-    return {
-        "_id": str(doc["_id"]),
-        "title": doc.get("title"),
-        "summary": doc.get("summary") if analyzed else doc.get("rss_summary"),
-        "original_url": doc.get("original_url"),
-        "image_url": doc.get("image_url"),
-        "source": doc.get("source"),
-        "category": doc.get("category"),
-        "published_date": doc.get("published_date"),
-        "analyzed": analyzed
-    }
+    get = doc.get
+    analyzed = get("analyzed", False)
+    out = {k: get(k) for k in _FMT_KEYS}
+    out["_id"] = str(doc["_id"])
+    out["summary"] = get("summary") if analyzed else get("rss_summary")
+    out["analyzed"] = analyzed
+    return out
 
 
 def fetch_news(context: dict, query_language=None, keyword=None):
@@ -156,7 +174,6 @@ def fetch_news(context: dict, query_language=None, keyword=None):
     cursor_filter = paginator.build_cursor_filter(cursor)
     
     results = []
-    seen_ids = set()
     tiers = build_discovery_tiers(context, query_language=query_language)
     
     # Generate tier level names dynamically to match actual tiers
@@ -186,10 +203,11 @@ def fetch_news(context: dict, query_language=None, keyword=None):
     # but we'll trim to 'limit' at the end.
     MAX_COLLECTION = 200 
 
-    for tier_level, tier_query in zip(tier_levels, tiers):
-        if len(results) >= MAX_COLLECTION:
-            break
-
+    # One aggregation for all tiers: each tier is a $unionWith branch tagged
+    # with its rank, and duplicates across nested tiers are collapsed in the
+    # server (keeping the highest-priority tier) so each doc crosses the wire once.
+    tier_pipelines = []
+    for tier_rank, tier_query in enumerate(tiers):
         # Apply Cursor Filter
         match_stage = tier_query.copy()
         if cursor_filter:
@@ -199,39 +217,80 @@ def fetch_news(context: dict, query_language=None, keyword=None):
 
         # Simplified Pipeline: Just match, sort, and limit. 
         # (Grouping by source was too restrictive for a complete feed)
-        pipeline = [
+        tier_pipelines.append([
             { "$match": match_stage },
             { "$sort": { "created_at": -1, "_id": -1 } },
-            { "$limit": MAX_COLLECTION }
-        ]
-
-        # Execute aggregation
-        batch = list(article_store.collection.aggregate(pipeline))
-
-        for article in batch:
-            aid = str(article["_id"])
-            if aid not in seen_ids:
-                # Rank scoring
-                article["_rank_score"] = ranker.score(
-                    article=article,
-                    context=context,
-                    tier_level=tier_level
-                )
-                results.append(article)
-                seen_ids.add(aid)
-
-            if len(results) >= MAX_COLLECTION:
-                break
+            { "$limit": MAX_COLLECTION },
+            { "$addFields": { "_tier_rank": tier_rank } }
+        ])
+
+    pipeline = list(tier_pipelines[0])
+    for tier_pipeline in tier_pipelines[1:]:
+        pipeline.append({
+            "$unionWith": {"coll": article_store.collection_name, "pipeline": tier_pipeline}
+        })
+    pipeline.extend([
+        { "$sort": { "_tier_rank": 1 } },
+        { "$group": { "_id": "$_id", "doc": { "$first": "$$ROOT" } } },
+        { "$replaceRoot": { "newRoot": "$doc" } },
+        { "$sort": { "_tier_rank": 1, "created_at": -1, "_id": -1 } },
+        { "$limit": MAX_COLLECTION }
+    ])
+
+    # Execute aggregation. batchSize matches the $limit so the whole result
+    # arrives in the first batch (more memory per reply, no getMore RTTs).
+    # maxTimeMS bounds a pathological tier, and the hint pins the primary
+    # tier to its compound index instead of trusting the planner under skew.
+    primary_level = tier_levels[0]
+    hint = (
+        discovery_index_name(primary_level)
+        if primary_level in DISCOVERY_TIER_FIELDS
+        else [("status", 1), ("created_at", -1)]
+    )
+    aggregate_options = {
+        "batchSize": MAX_COLLECTION,
+        "maxTimeMS": DISCOVERY_MAX_TIME_MS,
+        "allowDiskUse": False,
+    }
+    try:
+        try:
+            batch = list(article_store.collection.aggregate(pipeline, hint=hint, **aggregate_options))
+        except ExecutionTimeout:
+            raise
+        except OperationFailure as e:
+            # Hinted index missing or still building: let the planner choose
+            logger.warning(f"[fetch_news] Hinted discovery aggregation failed ({e}); retrying without hint")
+            batch = list(article_store.collection.aggregate(pipeline, **aggregate_options))
+    except ExecutionTimeout:
+        logger.warning(f"[fetch_news] Discovery aggregation exceeded {DISCOVERY_MAX_TIME_MS}ms; returning no results")
+        batch = []
+
+    # Score each tier's articles in one pass
+    by_tier = {}
+    for article in batch:
+        by_tier.setdefault(article["_tier_rank"], []).append(article)
+
+    for tier_rank, tier_articles in sorted(by_tier.items()):
+        rank_scores = ranker.score_batch(
+            tier_articles,
+            context=context,
+            tier_level=tier_levels[tier_rank]
+        )
+        for article, rank_score in zip(tier_articles, rank_scores.tolist()):
+            article["_rank_score"] = rank_score
+            # Sort key computed once here rather than on every heap comparison
+            created_at = article.get("created_at")
+            article["_sort_key"] = (
+                rank_score,
+                created_at.timestamp() if created_at and hasattr(created_at, "timestamp") else 0,
+                str(article["_id"])
+            )
+            results.append(article)
 
     # 2. Final Sorting (Rank first, then recency)
-    results.sort(
-        key=lambda a: (
-            a.get("_rank_score", 0), 
-            a.get("created_at").timestamp() if a.get("created_at") and hasattr(a.get("created_at"), "timestamp") else 0,
-            str(a.get("_id"))
-        ),
-        reverse=True
-    )
+    # Only the top limit+1 are needed (the extra one signals has_more), so a
+    # bounded heap selection replaces a full sort of up to MAX_COLLECTION docs.
+    results = heapq.nlargest(limit + 1, results, key=itemgetter("_sort_key"))
 
     # 3. Trim results + build next cursor
     has_more = len(results) > limit
@@ -295,38 +354,47 @@ def _fetch_news_by_keyword(keyword, limit, cursor, context, query_language):
     if context.get("analyzed") in ["true", True, "True", "1"]:
         query["analyzed"] = True
 
-    # Simple page-based skip for text search (or cursor if we had one for score)
-    # Since text search sort by score, we'll use a basic offset for now 
-    # as cursor-pagination on dynamic scores is complex.
-    page = int(context.get("page", 1))
-    skip = (page - 1) * limit
-
-    # Projection for score
-    projection = {"score": {"$meta": "textScore"}}
-    
-    cursor_obj = (
-        article_store.collection
-        .find(query, projection)
-        .sort([("score", {"$meta": "textScore"}), ("published_date", -1)])
-        .skip(skip)
-        .limit(limit + 1) # +1 to check if more
-    )
-    
-    results = list(cursor_obj)
+    # Cursor pagination on (textScore, _id): the score is materialized with
+    # $addFields so the cursor filter can be applied after $text matching,
+    # avoiding skip() which scans and discards every preceding document.
+    pipeline = [
+        {"$match": query},
+        {"$addFields": {"score": {"$meta": "textScore"}}}
+    ]
+    cursor_filter = keyword_paginator.build_cursor_filter(cursor)
+    if cursor_filter:
+        pipeline.append({"$match": cursor_filter})
+    pipeline.extend([
+        {"$sort": {"score": -1, "_id": -1}},
+        {"$limit": limit + 1}  # +1 to check if more
+    ])
+
+    try:
+        results = list(article_store.collection.aggregate(
+            pipeline,
+            batchSize=limit + 1,
+            maxTimeMS=KEYWORD_MAX_TIME_MS
+        ))
+    except ExecutionTimeout:
+        logger.warning(f"[keyword search] '{keyword}' exceeded {KEYWORD_MAX_TIME_MS}ms; returning no results")
+        results = []
     has_more = len(results) > limit
     results = results[:limit]
-    
+
+    next_cursor = None
+    if results and has_more:
+        next_cursor = keyword_paginator.encode_cursor(results[-1])
+
     # Format
     formatted = [_format_article(a) for a in results]
-    total = article_store.collection.count_documents(query)
 
     return {
         "status": "success",
         "count": len(formatted),
-        "total": total,
+        "total": None,  # count_documents on a $text query rescans the whole index
         "articles": formatted,
+        "next_cursor": next_cursor,
         "has_more": has_more,
-        "page": page,
         "keyword": keyword,
         "context": context
     }
@@ -337,7 +405,10 @@ def scrape_and_analyze_article(db, article_id, stages=None, visual=False):
     Flow 3: User clicks "Analyze"
     Fetches full content on-demand and runs the NLP pipeline.
     """
-    article_data = db.news_dataset.find_one({"_id": ObjectId(article_id)})
+    article_data = db.news_dataset.find_one(
+        {"_id": ObjectId(article_id)},
+        {"original_url": 1, "content": 1, "raw_text": 1, "title": 1}
+    )
     if not article_data:
         logger.error(f"Article {article_id} not found for analysis")
         return None
@@ -365,11 +436,8 @@ def scrape_and_analyze_article(db, article_id, stages=None, visual=False):
         raise ValueError(f"Article extraction failed and no local content/title for doc_id={article_id}")
 
     # 2. Run NLP Pipeline
-    # We update raw_text first
-    db.news_dataset.update_one(
-        {"_id": ObjectId(article_id)},
-        {"$set": {"raw_text": content}}
-    )
+    # raw_text is handed to the pipeline in memory and persisted together
+    # with the analyzed flags below, so a single write covers both.
 
     # Re-using the collection-agnostic pipeline
     result = process_document_pipeline(
@@ -391,19 +459,20 @@ def scrape_and_analyze_article(db, article_id, stages=None, visual=False):
             "deleted": False
         }
 
-    # 3. Mark as analyzed
+    # 3. Persist raw_text and mark as analyzed (update + read in one round-trip)
     #db.articles.update_one(
-    db.news_dataset.update_one(
+    return db.news_dataset.find_one_and_update(
         {"_id": ObjectId(article_id)},
         {"$set": {
+            "raw_text": content,
             "analyzed": True,
             "metadata.status": "completed",
             "metadata.analysis_stage": "level_2_complete",
             "metadata.analyzed_at": datetime.utcnow()
-        }}
+        }},
+        projection={"analyzed": 1, "status": 1, "metadata": 1},
+        return_document=ReturnDocument.AFTER
     )
-    #return db.articles.find_one({"_id": ObjectId(article_id)})
-    return db.news_dataset.find_one({"_id": ObjectId(article_id)})
 
 
 # For backward compatibility with routes/news.py
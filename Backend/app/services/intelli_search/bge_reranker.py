@@ -9,25 +9,101 @@ os.environ['TRANSFORMERS_CACHE'] = os.getenv('TRANSFORMERS_CACHE', r'D:\ML_Model
 
 from sentence_transformers import CrossEncoder
 from typing import List, Dict
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BGE_MODEL_NAME = "BAAI/bge-reranker-v2-m3"
+# Directory produced by export_quantized_bge(); enables the int8 ONNX Runtime path on CPU
+BGE_ONNX_DIR = os.getenv("BGE_ONNX_DIR")
+BGE_ONNX_FILE = "model_quantized.onnx"
 
 # Load once (global singleton)
 _bge_reranker = None
 
+
+class OnnxCrossEncoder:
+    """
+    CrossEncoder-compatible predict() backed by an int8-quantized ONNX export.
+    Scores go through the same sigmoid CrossEncoder applies to single-label
+    models, so thresholds downstream are unaffected by the backend choice.
+    """
+
+    def __init__(self, model_dir: str, max_length: int = 512):
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+        from transformers import AutoTokenizer
+
+        self.max_length = max_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.model = ORTModelForSequenceClassification.from_pretrained(
+            model_dir,
+            file_name=BGE_ONNX_FILE,
+            provider="CPUExecutionProvider"
+        )
+
+    def predict(self, pairs, batch_size: int = 32):
+        scores = []
+        for i in range(0, len(pairs), batch_size):
+            batch = pairs[i:i + batch_size]
+            encoded = self.tokenizer(
+                [q for q, _ in batch],
+                [t for _, t in batch],
+                padding="longest",
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np"
+            )
+            logits = np.asarray(self.model(**encoded).logits)[:, 0]
+            scores.append(1.0 / (1.0 + np.exp(-logits)))
+        return np.concatenate(scores) if scores else np.array([])
+
+
+def export_quantized_bge(save_dir: str):
+    """
+    Offline step: export the BGE reranker to ONNX and apply dynamic int8
+    quantization. Point BGE_ONNX_DIR at save_dir to serve it.
+    """
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    model = ORTModelForSequenceClassification.from_pretrained(BGE_MODEL_NAME, export=True)
+    model.save_pretrained(save_dir)
+    AutoTokenizer.from_pretrained(BGE_MODEL_NAME).save_pretrained(save_dir)
+
+    quantizer = ORTQuantizer.from_pretrained(save_dir)
+    quantizer.quantize(
+        save_dir=save_dir,
+        quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    )
+    logger.info(f"Quantized BGE reranker written to {save_dir}")
+
+
 def get_bge_reranker():
     global _bge_reranker
     if _bge_reranker is None:
-        _bge_reranker = CrossEncoder(
-            "BAAI/bge-reranker-v2-m3",
-            max_length=512
-        )
+        if BGE_ONNX_DIR and os.path.exists(os.path.join(BGE_ONNX_DIR, BGE_ONNX_FILE)):
+            try:
+                _bge_reranker = OnnxCrossEncoder(BGE_ONNX_DIR, max_length=512)
+                logger.info(f"BGE reranker loaded from int8 ONNX export: {BGE_ONNX_DIR}")
+            except Exception as e:
+                logger.warning(f"ONNX BGE reranker unavailable, falling back to PyTorch: {e}")
+
+        if _bge_reranker is None:
+            _bge_reranker = CrossEncoder(
+                BGE_MODEL_NAME,
+                max_length=512
+            )
     return _bge_reranker
 
 
-def rerank_with_bge(query: str, documents: List[Dict], top_k: int = 5):
+def rerank_with_bge(query: str, documents: List[Dict], top_k: int = 5, batch_size: int = 64):
     """
     documents: list of dicts with keys:
         - text
         - metadata (original article)
+    batch_size: pairs per forward pass; all pairs go to a single predict() call
     """
 
     if not documents:
@@ -35,23 +111,30 @@ def rerank_with_bge(query: str, documents: List[Dict], top_k: int = 5):
 
     reranker = get_bge_reranker()
 
-    pairs = [
-        (query, doc["text"])
-        for doc in documents
-    ]
-
-    scores = reranker.predict(pairs)
+    scores = np.asarray(
+        reranker.predict([(query, doc["text"]) for doc in documents], batch_size=batch_size),
+        dtype=np.float32
+    ).ravel()
 
-    ranked = sorted(
-        zip(documents, scores),
-        key=lambda x: x[1],
-        reverse=True
-    )
+    # Top-k selection: argpartition is O(N), then only the k winners are sorted
+    k = min(top_k, len(scores))
+    if k <= 0:
+        return []
+    if k < len(scores):
+        top_idx = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top_idx = np.arange(len(scores))
+    top_idx = top_idx[np.argsort(-scores[top_idx], kind="stable")]
 
     return [
         {
-            **doc["metadata"], # Unwrap the article from the 'metadata' wrapper
-            "bge_score": float(score)
+            **documents[i]["metadata"], # Unwrap the article from the 'metadata' wrapper
+            "bge_score": float(scores[i])
         }
-        for doc, score in ranked[:top_k]
+        for i in top_idx
     ]
+
+
+if __name__ == "__main__":
+    import sys
+    export_quantized_bge(sys.argv[1] if len(sys.argv) > 1 else "bge_reranker_onnx")
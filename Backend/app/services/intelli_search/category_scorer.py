@@ -1,8 +1,8 @@
 import json
+import threading
+from collections import OrderedDict
 from app.services.intelli_search.ollama_client import get_ollama_llm
 
-llm = get_ollama_llm()
-
 CATEGORY_PROMPT = """
 You are ranking news relevance.
 
@@ -22,29 +22,75 @@ Categories:
 {categories}
 """
 
-def score_categories_with_llm(query: str, categories: list[str]) -> dict:
-    if not categories:
-        return {}
+def _category_schema(categories: tuple) -> dict:
+    """JSON schema forcing exactly one numeric score per category."""
+    return {
+        "type": "object",
+        "properties": {c: {"type": "number"} for c in categories},
+        "required": list(categories)
+    }
+
+
+# Scores per (normalized query, category tuple). The normalized query is only
+# the key: the LLM sees the caller's original text, since case carries meaning
+# ("US" vs "us", "IT" vs "it").
+SCORE_CACHE_MAXSIZE = 1024
+_score_cache = OrderedDict()
+_score_lock = threading.Lock()
+
+
+def _cached_scores(query: str, q_norm: str, categories: tuple) -> dict:
+    key = (q_norm, categories)
+    with _score_lock:
+        scores = _score_cache.get(key)
+        if scores is not None:
+            _score_cache.move_to_end(key)
+            return scores
+
+    scores = _score(query, categories)
+
+    with _score_lock:
+        _score_cache[key] = scores
+        _score_cache.move_to_end(key)
+        while len(_score_cache) > SCORE_CACHE_MAXSIZE:
+            _score_cache.popitem(last=False)
+    return scores
 
+
+def _score(query: str, categories: tuple) -> dict:
     messages = [
-        {"role": "system", "content": "You are a news relevance ranking engine. Return ONLY JSON."},
+        {"role": "system", "content": "You are a news relevance ranking engine."},
         {"role": "user", "content": CATEGORY_PROMPT.format(
             query=query,
-            categories=", ".join(sorted(set(categories)))
+            categories=", ".join(categories)
         )}
     ]
 
-    try:
-        response = llm.invoke(messages)
-        parsed = json.loads(response.content)
+    # Schema-constrained decoding: Ollama can only emit the expected object
+    llm = get_ollama_llm(format=_category_schema(categories))
+    response = llm.invoke(messages)
+    parsed = json.loads(response.content)
+
+    return {
+        k.lower(): float(v)
+        for k, v in parsed.items()
+        if isinstance(v, (int, float))
+    }
+
+
+def score_categories_with_llm(query: str, categories: list[str]) -> dict:
+    if not categories:
+        return {}
 
-        return {
-            k.lower(): float(v)
-            for k, v in parsed.items()
-            if isinstance(v, (int, float))
-        }
+    # Cache key: normalized query + stable category tuple. Failures raise
+    # out of the cached call, so fail-safe scores are never memoized.
+    q_norm = " ".join(str(query).lower().split())
+    cat_key = tuple(sorted(set(c.lower() for c in categories)))
+
+    try:
+        return dict(_cached_scores(query, q_norm, cat_key))
 
     except Exception as e:
         print(f"DEBUG: Category Scorer Failed: {e}")
-        # Fail safe: neutral scores
+        # Fail safe (Ollama unreachable): neutral scores
         return {c.lower(): 1.0 for c in categories}
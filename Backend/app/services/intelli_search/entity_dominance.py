@@ -1,3 +1,13 @@
+import re
+from collections import Counter
+from functools import lru_cache
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
 def entity_dominance_score(entity: str, text: str) -> float:
     """
     Measures how dominant an entity is in the text.
@@ -16,32 +26,93 @@ def entity_dominance_score(entity: str, text: str) -> float:
     if not text or not entity:
         return 0.0
     
-    entity = entity.lower()
-    text = text.lower()
-    
-    total_tokens = len(text.split())
-    entity_mentions = text.count(entity)
-    
-    if total_tokens == 0:
-        return 0.0
-    
-    # Calculate dominance ratio
-    dominance = entity_mentions / total_tokens
-    
-    return min(dominance, 1.0)  # Cap at 1.0
+    # Same C-level scan as the multi-entity path (ratio capped at 1.0)
+    return multi_entity_dominance([entity], text)
+
+
+@lru_cache(maxsize=256)
+def _entity_pattern(entities: frozenset):
+    """
+    Compile a single alternation regex for a set of lowercased entities.
+
+    Returns None when two entities can overlap in text (one contains the
+    other, or one ends with the other's start, e.g. "new york" / "york city"):
+    a single scan would attribute the shared span to only one of them, whereas
+    entity_dominance_score counts each entity independently.
+    """
+    for a in entities:
+        for b in entities:
+            if a == b:
+                continue
+            if a in b or any(a.endswith(b[:k]) for k in range(1, min(len(a), len(b)))):
+                return None
+    # Longest first so the alternation prefers the full entity
+    ordered = sorted(entities, key=len, reverse=True)
+    return re.compile("|".join(re.escape(e) for e in ordered))
+
+
+@lru_cache(maxsize=256)
+def _entity_automaton(entities: frozenset):
+    """
+    Aho-Corasick automaton over a set of lowercased entities (pyahocorasick).
+    Unlike the regex alternation it reports every entity at every position,
+    so entities that contain one another are still counted independently.
+    """
+    automaton = ahocorasick.Automaton()
+    for entity in entities:
+        automaton.add_word(entity, entity)
+    automaton.make_automaton()
+    return automaton
+
+
+def _automaton_counts(automaton, text):
+    """
+    Non-overlapping occurrences per entity, matching str.count: a match of an
+    entity that overlaps its own previous match ("aa" in "aaaa") is skipped.
+    Matches arrive in end order, which for one entity is also start order.
+    """
+    counts = Counter()
+    last_end = {}
+    for end, entity in automaton.iter(text):
+        if end - len(entity) >= last_end.get(entity, -1):
+            counts[entity] += 1
+            last_end[entity] = end
+    return counts
 
 
 def multi_entity_dominance(entities: list, text: str) -> float:
     """
     Calculate combined dominance for multiple entities.
     Useful for queries like "roads in china" (both "roads" and "china").
-    
+
     Returns the average dominance across all entities.
+    The text is lowercased and tokenized once, and all entity mentions are
+    counted in a single pass (Aho-Corasick when pyahocorasick is installed,
+    else one regex) instead of one scan per entity.
     """
-    
+
     if not entities or not text:
         return 0.0
-    
-    scores = [entity_dominance_score(entity, text) for entity in entities]
-    
-    return sum(scores) / len(scores) if scores else 0.0
+
+    text_l = text.lower()
+    total_tokens = len(text_l.split())
+    if total_tokens == 0:
+        return 0.0
+
+    lowered = [e.lower() if e else "" for e in entities]
+    unique = frozenset(e for e in lowered if e)
+    if not unique:
+        return 0.0
+
+    if ahocorasick is not None:
+        counts = _automaton_counts(_entity_automaton(unique), text_l)
+    else:
+        pattern = _entity_pattern(unique)
+        if pattern is not None:
+            counts = Counter(m.group() for m in pattern.finditer(text_l))
+        else:
+            counts = {e: text_l.count(e) for e in unique}
+
+    scores = [min(counts.get(e, 0) / total_tokens, 1.0) if e else 0.0 for e in lowered]
+
+    return sum(scores) / len(scores)
@@ -1,9 +1,24 @@
-def generate_hypothetical_answer(query, llm):
-    """
-    Generates a short, factual, news-style pseudo-answer
-    used ONLY for vector retrieval (never shown to user).
-    """
+import os
+import threading
+import time
+from collections import OrderedDict
+from app.services.intelli_search.ollama_client import get_ollama_llm, OLLAMA_MODEL
+
+# HyDE answers per (model, normalized query); expire so they track the model's
+# current answer for time-sensitive queries instead of living forever.
+HYDE_CACHE_MAXSIZE = 1024
+HYDE_CACHE_TTL_SECONDS = float(os.getenv("HYDE_CACHE_TTL_SECONDS", "3600"))
 
+_hyde_cache = OrderedDict()
+_hyde_lock = threading.Lock()
+
+
+def _normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace so trivially different queries share a cache slot."""
+    return " ".join(str(query).lower().split())
+
+
+def _generate(query, llm):
     prompt = f"""
     Write a factual, neutral news-style answer (maximum 3 sentences)
     that would directly answer the query below.
@@ -23,3 +38,36 @@ def generate_hypothetical_answer(query, llm):
     sentences = text.split(".")[:3]
 
     return ". ".join(sentences).strip()
+
+
+def _cached_hyde(query: str, q_norm: str) -> str:
+    # q_norm is only the cache key; the prompt gets the user's original text
+    key = (OLLAMA_MODEL, q_norm)
+    now = time.monotonic()
+    with _hyde_lock:
+        entry = _hyde_cache.get(key)
+        if entry is not None and now - entry[0] < HYDE_CACHE_TTL_SECONDS:
+            _hyde_cache.move_to_end(key)
+            return entry[1]
+
+    text = _generate(query, get_ollama_llm())
+
+    with _hyde_lock:
+        _hyde_cache[key] = (now, text)
+        _hyde_cache.move_to_end(key)
+        while len(_hyde_cache) > HYDE_CACHE_MAXSIZE:
+            _hyde_cache.popitem(last=False)
+    return text
+
+
+def generate_hypothetical_answer(query, llm=None):
+    """
+    Generates a short, factual, news-style pseudo-answer
+    used ONLY for vector retrieval (never shown to user).
+
+    Without an explicit llm the answer is memoized per normalized query,
+    so repeated searches skip the Ollama round-trip.
+    """
+    if llm is not None:
+        return _generate(query, llm)
+    return _cached_hyde(query, _normalize_query(query))
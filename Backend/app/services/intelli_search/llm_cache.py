@@ -0,0 +1,112 @@
+"""
+Exact-match cache for parsed LLM responses.
+
+Query understanding prompts are deterministic enough (temperature <= 0.1)
+that an identical (model, format, messages, temperature) request can reuse the
+previous parsed result instead of another Ollama round-trip.
+
+Entries live in a process-local LRU. When REDIS_URL is set and the redis
+package is installed, entries are also written to Redis with a TTL so other
+worker processes can reuse them.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_MAXSIZE = 4096
+LLM_CACHE_TTL_SECONDS = 3600
+REDIS_URL = os.getenv("REDIS_URL")
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+_redis = None
+_redis_checked = False
+
+
+def _get_redis():
+    """Lazily connect to Redis if configured; returns None otherwise."""
+    global _redis, _redis_checked
+    if _redis_checked:
+        return _redis
+    _redis_checked = True
+    if not REDIS_URL:
+        return None
+    try:
+        import redis
+        _redis = redis.Redis.from_url(REDIS_URL)
+        _redis.ping()
+        logger.info("LLM cache: Redis backend enabled")
+    except ImportError:
+        logger.warning("LLM cache: REDIS_URL set but redis package not installed; using memory only")
+        _redis = None
+    except Exception as e:
+        logger.warning(f"LLM cache: Redis unavailable ({e}); using memory only")
+        _redis = None
+    return _redis
+
+
+def make_key(llm, messages) -> str:
+    """SHA256 over the request fields that determine the LLM output."""
+    payload = {
+        "model": getattr(llm, "model", None),
+        "temperature": getattr(llm, "temperature", None),
+        "format": getattr(llm, "format", None),
+        "messages": messages,
+    }
+    if orjson is not None:
+        raw = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS, default=str)
+    else:
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def get(key: str):
+    """Return a copy of the cached value for key, or None on a miss."""
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return copy.deepcopy(_cache[key])
+
+    client = _get_redis()
+    if client is not None:
+        try:
+            raw = client.get(f"llm_cache:{key}")
+            if raw is not None:
+                value = json.loads(raw)
+                _store_local(key, value)
+                return value
+        except Exception as e:
+            logger.warning(f"LLM cache: Redis read failed: {e}")
+    return None
+
+
+def put(key: str, value) -> None:
+    """Store a JSON-serializable value under key."""
+    _store_local(key, value)
+
+    client = _get_redis()
+    if client is not None:
+        try:
+            client.setex(f"llm_cache:{key}", LLM_CACHE_TTL_SECONDS, json.dumps(value, default=str))
+        except Exception as e:
+            logger.warning(f"LLM cache: Redis write failed: {e}")
+
+
+def _store_local(key: str, value) -> None:
+    with _lock:
+        _cache[key] = copy.deepcopy(value)
+        _cache.move_to_end(key)
+        while len(_cache) > LLM_CACHE_MAXSIZE:
+            _cache.popitem(last=False)
@@ -1,16 +1,101 @@
 from langchain_ollama import ChatOllama
+import json
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1:8b")
+# Keep the model (and its prompt-prefix KV cache) resident between requests
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "24h")
 
-def get_ollama_llm(temperature: float = 0.2):
+def get_ollama_llm(temperature: float = 0.2, format=None):
     """
     Returns a configured Ollama LLM instance.
     Used for query understanding, expansion, and reranking.
+
+    format: optional Ollama output constraint, either "json" or a JSON
+    schema dict, so callers that parse the reply get valid JSON directly.
     """
     return ChatOllama(
         base_url=OLLAMA_BASE_URL,
         model=OLLAMA_MODEL,
         temperature=temperature,
+        format=format,
+        keep_alive=OLLAMA_KEEP_ALIVE,
     )
+
+
+def loads_json(raw):
+    """
+    Parse JSON text from an LLM reply.
+    Uses orjson when installed (C parser, several times faster), else stdlib.
+    Both raise json.JSONDecodeError subclasses on bad input.
+    """
+    if orjson is not None:
+        return orjson.loads(raw.encode("utf-8") if isinstance(raw, str) else raw)
+    return json.loads(raw)
+
+
+def extract_json(raw: str):
+    """
+    Parse an LLM reply that should be JSON.
+    Well-behaved replies parse directly; otherwise the span from the first
+    "{" to the last "}" is parsed (markdown ticks, leading/trailing chatter).
+    Raises ValueError when neither works.
+    """
+    try:
+        return loads_json(raw)
+    except ValueError:
+        start = raw.find("{")
+        end = raw.rfind("}", start) if start >= 0 else -1
+        if end < 0:
+            raise
+    return loads_json(raw[start:end + 1])
+
+
+def stream_json(llm, messages):
+    """
+    Stream a chat reply and stop as soon as the first top-level JSON object
+    closes, instead of waiting for end-of-generation (JSON-mode models often
+    pad the reply with trailing whitespace). Leaving the generator closes
+    the HTTP stream so Ollama stops generating.
+
+    Returns (text, response_metadata); metadata such as prompt_eval_count
+    only arrives on the final chunk, so it is empty when stopped early.
+    """
+    parts = []
+    meta = {}
+    depth = 0
+    started = in_str = escaped = False
+
+    for chunk in llm.stream(messages):
+        if chunk.response_metadata:
+            meta.update(chunk.response_metadata)
+        text = chunk.content or ""
+        for i, ch in enumerate(text):
+            if in_str:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_str = False
+            elif ch == "{":
+                depth += 1
+                started = True
+            elif not started:
+                continue
+            elif ch == '"':
+                in_str = True
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    parts.append(text[:i + 1])
+                    return "".join(parts), meta
+        parts.append(text)
+
+    return "".join(parts), meta
@@ -1,4 +1,5 @@
-from app.services.intelli_search.ollama_client import get_ollama_llm
+from app.services.intelli_search.ollama_client import get_ollama_llm, extract_json, stream_json
+from app.services.intelli_search import llm_cache
 import json
 import logging
 
@@ -29,6 +30,66 @@ User query:
 "{query}"
 """
 
+# Same shape as the prompt's Schema block; passed to Ollama for constrained decoding
+DECOMPOSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "is_multi_intent": {"type": "boolean"},
+        "reason": {"type": "string"},
+        "sub_queries": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["is_multi_intent", "reason", "sub_queries"]
+}
+
+def _build_decomp_messages(query: str) -> list:
+    return [{
+        "role": "user",
+        "content": DECOMPOSE_PROMPT.format(query=query)
+    }]
+
+
+def _parse_decomp_response(raw_content: str, query: str):
+    """
+    Parse the decomposer's reply into the public result shape.
+    Returns (result, cacheable); only replies that parsed are cacheable.
+    """
+    # Robust JSON extraction (handles markdown ticks or leading/trailing text)
+    try:
+        parsed = extract_json(raw_content)
+    except Exception as e:
+        logger.error(f"Failed to extract JSON from content: {e}")
+        parsed = {}
+    if not isinstance(parsed, dict):
+        parsed = {}
+    
+    # Safety guardrails
+    if not parsed.get("is_multi_intent"):
+        return {
+            "is_multi_intent": False,
+            "reason": parsed.get("reason", "Single intent"),
+            "sub_queries": []
+        }, bool(parsed)
+    
+    sub_queries = parsed.get("sub_queries", [])
+    
+    # Validate sub-queries
+    if not isinstance(sub_queries, list) or len(sub_queries) < 2:
+        logger.warning(f"Invalid decomposition for '{query}': {sub_queries}")
+        return {
+            "is_multi_intent": False,
+            "reason": "Invalid decomposition",
+            "sub_queries": []
+        }, False
+    
+    logger.info(f"Multi-intent detected: {query} -> {sub_queries}")
+    
+    return {
+        "is_multi_intent": True,
+        "reason": parsed.get("reason", "Multiple intents detected"),
+        "sub_queries": sub_queries
+    }, True
+
+
 def detect_query_decomposition(query: str) -> dict:
     """
     Detect if a query contains multiple distinct intents.
@@ -47,58 +108,23 @@ def detect_query_decomposition(query: str) -> dict:
     """
     
     try:
-        llm = get_ollama_llm(temperature=0.0)  # Deterministic for consistency
-        
-        response = llm.invoke([{
-            "role": "user",
-            "content": DECOMPOSE_PROMPT.format(query=query)
-        }])
-        
-        raw_content = response.content.strip() if hasattr(response, 'content') else str(response).strip()
-        
-        # Robust JSON extraction (handles markdown ticks or leading/trailing text)
-        if "{" in raw_content and "}" in raw_content:
-            try:
-                # Find the first { and last }
-                start_idx = raw_content.find("{")
-                end_idx = raw_content.rfind("}") + 1
-                json_str = raw_content[start_idx:end_idx]
-                parsed = json.loads(json_str)
-            except Exception as e:
-                logger.error(f"Failed to extract JSON from content: {e}")
-                parsed = {}
-        else:
-            try:
-                parsed = json.loads(raw_content)
-            except:
-                parsed = {}
-        
-        # Safety guardrails
-        if not parsed.get("is_multi_intent"):
-            return {
-                "is_multi_intent": False,
-                "reason": parsed.get("reason", "Single intent"),
-                "sub_queries": []
-            }
-        
-        sub_queries = parsed.get("sub_queries", [])
-        
-        # Validate sub-queries
-        if not isinstance(sub_queries, list) or len(sub_queries) < 2:
-            logger.warning(f"Invalid decomposition for '{query}': {sub_queries}")
-            return {
-                "is_multi_intent": False,
-                "reason": "Invalid decomposition",
-                "sub_queries": []
-            }
-        
-        logger.info(f"Multi-intent detected: {query} -> {sub_queries}")
+        llm = get_ollama_llm(temperature=0.0, format=DECOMPOSE_SCHEMA)  # Deterministic for consistency
+        messages = _build_decomp_messages(query)
+
+        # Temperature 0: identical prompts give identical answers, replay them
+        cache_key = llm_cache.make_key(llm, messages)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Stops reading once the JSON object is complete
+        raw_content, _ = stream_json(llm, messages)
+        raw_content = raw_content.strip()
         
-        return {
-            "is_multi_intent": True,
-            "reason": parsed.get("reason", "Multiple intents detected"),
-            "sub_queries": sub_queries
-        }
+        result, cacheable = _parse_decomp_response(raw_content, query)
+        if cacheable:
+            llm_cache.put(cache_key, result)
+        return result
         
     except json.JSONDecodeError as e:
         logger.error(f"JSON parsing failed for query '{query}': {e}")
@@ -1,5 +1,13 @@
-from app.services.intelli_search.ollama_client import get_ollama_llm
-import json
+from app.services.intelli_search.ollama_client import get_ollama_llm, extract_json, stream_json
+from app.services.intelli_search import llm_cache
+from app.services.intelli_search.semantic_cache import SemanticCache
+from app.services.intelli_search.query_decomposer import detect_query_decomposition
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
 
 # Lazy initialization to avoid blocking server startup
 _llm = None
@@ -7,9 +15,46 @@ _llm = None
 def _get_llm():
     global _llm
     if _llm is None:
-        _llm = get_ollama_llm(temperature=0.1)
+        # JSON mode: Ollama constrains decoding to valid JSON
+        _llm = get_ollama_llm(temperature=0.1, format="json")
+        # Load the model (and prefill SYSTEM_PROMPT) without blocking the caller
+        threading.Thread(target=_prime_llm, args=(_llm,), daemon=True).start()
     return _llm
 
+
+def warmup():
+    """Create the intent LLM at startup; priming runs in the background."""
+    _get_llm()
+
+
+def _prime_llm(llm):
+    """
+    One-token request so Ollama loads the model and caches the SYSTEM_PROMPT
+    prefix before the first real query. The model then stays resident for
+    OLLAMA_KEEP_ALIVE (set it to -1 to pin it indefinitely).
+    """
+    try:
+        llm.invoke(
+            [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": "ok"}],
+            options={"num_predict": 1},
+        )
+        logger.info("Intent LLM warmup complete")
+    except Exception as e:
+        logger.warning(f"Intent LLM warmup failed: {e}")
+
+
+# Near-duplicate query cache (cosine similarity on query embeddings).
+# Opt-in: queries that differ only in a place or name ("floods in india" vs
+# "floods in pakistan") are well above the threshold under e5, so a hit would
+# replay the other query's entities and country filters. Off, it also saves
+# the extra encode per search.
+SEMANTIC_CACHE_ENABLED = os.getenv("INTELLI_SEARCH_SEMANTIC_CACHE", "0") == "1"
+_semantic_cache = SemanticCache(
+    threshold=float(os.getenv("INTELLI_SEARCH_SEMANTIC_THRESHOLD", "0.95")),
+    max_entries=10000,
+    ttl_seconds=float(os.getenv("INTELLI_SEARCH_SEMANTIC_TTL", "3600"))
+)
+
 SYSTEM_PROMPT = """
 You are an advanced news query intelligence system. Your goal is to DEEPLY UNDERSTAND what the user truly wants to find.
 
@@ -82,31 +127,82 @@ Analyze the user's query to understand:
 
 import re
 
-def infer_time_window_days(query: str):
-    query = query.lower()
+# Time-window rules. When several match, the narrowest window wins.
+TIME_WINDOW_TERMS = {
+    "today": 1, "latest": 1, "current": 1, "now": 1,
+    "yesterday": 2,
+    "recent": 7, "recently": 7, "last week": 7,
+    "last month": 30,
+}
+
+# Direct category keywords (checked before the LLM). Matching is whole-word
+# (plus "s"/"es" plurals), so other inflections a query may use are listed too.
+CATEGORY_KEYWORDS = {
+    "disaster": ["disaster", "earthquake", "flood", "flooding", "flooded", "tsunami", "hurricane", "tornado"],
+    "terror": ["terror", "terrorism", "terrorist", "attack", "attacked", "bombing", "bombed"],
+    "infrastructure": ["infrastructure", "construction", "building", "bridge", "road"],
+    "business": ["business", "economy", "market", "trade", "trader", "finance"],
+    "politics": ["politics", "election", "government", "governmental", "parliament"],
+    "technology": ["technology", "technologies", "technological", "tech", "ai", "software", "innovation"]
+}
+KEYWORD_TO_CATEGORY = {kw: cat for cat, kws in CATEGORY_KEYWORDS.items() for kw in kws}
+
+# Queries are tokenized once and matched by dict lookup (whole words only,
+# so "attackers" no longer counts as "attack"). The two-word time phrases are
+# tried before the plain word at the same position.
+_TOKEN_SPLIT = re.compile(r"last (?:week|month)\b|[a-z]+")
 
-    if re.search(r"\b(today|latest|current|now)\b", query):
-        return 1
-    if re.search(r"\b(yesterday)\b", query):
-        return 2
-    if re.search(r"\b(recent|recently)\b", query):
-        return 7
-    if re.search(r"\b(last week)\b", query):
-        return 7
-    if re.search(r"\b(last month)\b", query):
-        return 30
+# Keyword table expanded once with plain plural forms ("floods", "tornadoes"),
+# so each query token costs a single dict lookup.
+_TOKEN_TO_CATEGORY = dict(KEYWORD_TO_CATEGORY)
+for _kw, _cat in KEYWORD_TO_CATEGORY.items():
+    _TOKEN_TO_CATEGORY.setdefault(_kw + "s", _cat)
+    _TOKEN_TO_CATEGORY.setdefault(_kw + "es", _cat)
 
-    return None
+
+def _scan_rule_signals(query_lower: str):
+    """
+    Single pass over the lowercased query for the rule-derived signals.
+    Returns (direct_categories in CATEGORY_KEYWORDS order, time_window_days).
+    """
+    token_to_category = _TOKEN_TO_CATEGORY
+    time_terms = TIME_WINDOW_TERMS
+    matched = set()
+    time_window_days = None
+    for token in _TOKEN_SPLIT.findall(query_lower):
+        days = time_terms.get(token)
+        if days is not None:
+            if time_window_days is None or days < time_window_days:
+                time_window_days = days
+            continue
+        category = token_to_category.get(token)
+        if category:
+            matched.add(category)
+    return [c for c in CATEGORY_KEYWORDS if c in matched], time_window_days
+
+# Rule-only fast path (skips the LLM when keywords already settle the category)
+FAST_PATH_ENABLED = os.getenv("INTELLI_SEARCH_FAST_PATH", "0") == "1"
+_MULTI_INTENT_RE = re.compile(r"\b(vs|versus|and|compare)\b|,")
+
+def infer_time_window_days(query: str):
+    return _scan_rule_signals(query.lower())[1]
 
 def normalize_expanded_terms(expanded_terms, max_terms=6):
     """Limit and clean expanded terms to avoid noise."""
     if not expanded_terms: return []
     if not isinstance(expanded_terms, list): expanded_terms = [expanded_terms]
-    cleaned = []
+    # Ordered dedupe that stops once max_terms unique terms are collected
+    seen = set()
+    out = []
     for term in expanded_terms:
-        if isinstance(term, str) and len(term.strip()) > 2:
-            cleaned.append(term.strip())
-    return list(dict.fromkeys(cleaned))[:max_terms]
+        if isinstance(term, str):
+            t = term.strip()
+            if len(t) > 2 and t not in seen:
+                seen.add(t)
+                out.append(t)
+                if len(out) == max_terms:
+                    break
+    return out
 
 def normalize_signals(data: dict, key: str) -> dict:
     """
@@ -122,10 +218,15 @@ def normalize_signals(data: dict, key: str) -> dict:
         # Convert list of {type/key, value} to dict
         normalized = {}
         for item in raw:
-            if isinstance(item, dict):
-                # Try to find a key/value pair
-                k = item.get("type") or item.get("key") or next(iter(item.keys()), None)
-                v = item.get("value") or item.get("name") or next(iter(item.values()), None)
+            if isinstance(item, dict) and item:
+                # Try to find a key/value pair; the first entry is the fallback
+                k = item.get("type") or item.get("key")
+                v = item.get("value") or item.get("name")
+                if not (k and v):
+                    for first_k, first_v in item.items():
+                        break
+                    k = k or first_k
+                    v = v or first_v
                 if k and v:
                     if k not in normalized: normalized[k] = []
                     if isinstance(v, list): normalized[k].extend(v)
@@ -136,6 +237,65 @@ def normalize_signals(data: dict, key: str) -> dict:
 
 from app.services.intelli_search.query_translator import translate_query_if_needed
 
+def _analyze_intent(canonical_query: str) -> dict:
+    """
+    Runs the intent-analysis LLM prompt and returns the parsed JSON dict.
+    Identical prompts are answered from the exact-match LLM cache.
+    """
+    # Use canonical (English) query for LLM
+    prompt = f'User Query: "{canonical_query}"'
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+    llm = _get_llm()
+    cache_key = llm_cache.make_key(llm, messages)
+    data = llm_cache.get(cache_key)
+    if data is not None:
+        return data
+
+    raw_content, meta = stream_json(llm, messages)
+    raw_content = raw_content.strip()
+
+    # SYSTEM_PROMPT is a fixed prefix, so with the model kept alive Ollama reuses
+    # its KV cache and prompt_eval_count should cover only the user turn.
+    if "prompt_eval_count" in meta:
+        logger.debug(
+            f"Intent LLM prompt_eval_count={meta.get('prompt_eval_count')} "
+            f"prompt_eval_duration={meta.get('prompt_eval_duration')}ns"
+        )
+    
+    # Robust JSON extraction
+    try:
+        data = extract_json(raw_content)
+    except Exception as e:
+        logger.error(f"Failed to extract JSON in query_processor: {e}")
+        data = {}
+
+    if isinstance(data, list) and len(data) > 0:
+        data = data[0]
+    if not isinstance(data, dict):
+        data = {}
+
+    # Only successful parses are worth replaying
+    if data:
+        llm_cache.put(cache_key, data)
+    return data
+
+
+def _embed_for_cache(text: str):
+    """Embedding used as the semantic cache key; None if the encoder is unavailable."""
+    if not SEMANTIC_CACHE_ENABLED:
+        return None
+    try:
+        from app.services.intelli_search.vector_retriever import get_cached_embedding
+        return get_cached_embedding(text)
+    except Exception as e:
+        logger.warning(f"Semantic cache disabled for this query (embedding failed): {e}")
+        return None
+
+
 def process_query(query: str) -> dict:
     """
     Converts a human language query into structured search signals.
@@ -147,53 +307,53 @@ def process_query(query: str) -> dict:
     # 🎯 DIRECT CATEGORY MAPPING: Handle obvious category keywords before LLM
     # This ensures "disaster news" maps to "disaster" category, not "accidents"
     query_lower = canonical_query.lower()
-    direct_categories = []
-    
-    CATEGORY_KEYWORDS = {
-        "disaster": ["disaster", "earthquake", "flood", "tsunami", "hurricane", "tornado"],
-        "terror": ["terror", "terrorism", "attack", "bombing"],
-        "infrastructure": ["infrastructure", "construction", "building", "bridge", "road"],
-        "business": ["business", "economy", "market", "trade", "finance"],
-        "politics": ["politics", "election", "government", "parliament"],
-        "technology": ["technology", "tech", "ai", "software", "innovation"]
-    }
-    
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        if any(keyword in query_lower for keyword in keywords):
-            direct_categories.append(category)
-    
-    # Use canonical (English) query for LLM
-    prompt = f'User Query: "{canonical_query}"'
+    # The time window comes from the same scan of the CANONICAL (English) query
+    direct_categories, time_window_days = _scan_rule_signals(query_lower)
 
-    response = _get_llm().invoke(
-        [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": prompt}
-        ]
-    )
+    # ⚡ FAST PATH: short, single-topic queries whose category is already known
+    # from keywords (e.g. "all disaster news") don't need either LLM call.
+    if (
+        FAST_PATH_ENABLED
+        and direct_categories
+        and len(canonical_query.split()) <= 4
+        and not _MULTI_INTENT_RE.search(query_lower)
+    ):
+        logger.info(f"Fast path: direct categories {direct_categories} for query: {canonical_query}")
+        return {
+            "original_query": query,
+            "canonical_query": canonical_query,
+            "detected_language": translation["detected_language"],
+            "intent": "news",
+            "entities": {},
+            "expanded_terms": normalize_expanded_terms([canonical_query]),
+            "suggested_filters": {"category": direct_categories},
+            "time_window_days": time_window_days,
+            "decomposition": {"is_multi_intent": False, "reason": "fast-path", "sub_queries": []}
+        }
 
-    raw_content = response.content.strip() if hasattr(response, 'content') else str(response).strip()
-    
-    # Robust JSON extraction
-    if "{" in raw_content and "}" in raw_content:
-        try:
-            start_idx = raw_content.find("{")
-            end_idx = raw_content.rfind("}") + 1
-            json_str = raw_content[start_idx:end_idx]
-            data = json.loads(json_str)
-        except Exception as e:
-            logger.error(f"Failed to extract JSON in query_processor: {e}")
-            data = {}
+    # 🧠 SEMANTIC CACHE: paraphrases of an earlier query reuse its LLM signals.
+    # The rule-derived signals form the tag, so a hit also needs them to agree.
+    semantic_tag = (tuple(direct_categories), time_window_days)
+    query_vector = _embed_for_cache(canonical_query)
+    cached = _semantic_cache.lookup(query_vector, semantic_tag) if query_vector is not None else None
+
+    if cached is not None:
+        logger.info(f"Semantic cache hit for query: {canonical_query}")
+        data = cached["data"]
+        decomposition = cached["decomposition"]
     else:
-        try:
-            data = json.loads(raw_content)
-        except:
-            data = {}
+        # STEP 5 — Detect multi-intent queries (NEW - Phase 10)
+        # Intent analysis and decomposition only depend on the canonical query,
+        # so both Ollama prompts are in flight together (needs OLLAMA_NUM_PARALLEL>=2
+        # on the server to actually overlap).
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            intent_future = executor.submit(_analyze_intent, canonical_query)
+            decomp_future = executor.submit(detect_query_decomposition, canonical_query)
+            data = intent_future.result()
+            decomposition = decomp_future.result()
 
-    if isinstance(data, list) and len(data) > 0:
-        data = data[0]
-    if not isinstance(data, dict):
-        data = {}
+        if query_vector is not None and data:
+            _semantic_cache.add(query_vector, {"data": data, "decomposition": decomposition}, semantic_tag)
 
     # Standardize all signals
     entities = normalize_signals(data, "entities")
@@ -202,13 +362,6 @@ def process_query(query: str) -> dict:
     # Fallback to CANONICAL query for expansion if needed
     expanded_terms = normalize_expanded_terms(data.get("expanded_terms", [canonical_query]))
     
-    # Detect time window from CANONICAL query (English regex)
-    time_window_days = infer_time_window_days(canonical_query)
-    
-    # STEP 5 — Detect multi-intent queries (NEW - Phase 10)
-    from app.services.intelli_search.query_decomposer import detect_query_decomposition
-    decomposition = detect_query_decomposition(canonical_query)
-    
     # 🎯 Merge direct categories with LLM suggestions (direct takes priority)
     llm_categories = suggested_filters.get("category", [])
     if direct_categories:
@@ -1,15 +1,119 @@
+from functools import lru_cache
+import logging
+import os
+import threading
 from argostranslate import translate
-from langdetect import detect
+from langdetect import DetectorFactory, detect
+
+try:
+    import fasttext
+except ImportError:
+    fasttext = None
+
+logger = logging.getLogger(__name__)
+
+# langdetect is randomized unless seeded
+DetectorFactory.seed = 0
+
+# fastText language-ID model (lid.176.ftz); langdetect is used when unavailable
+FASTTEXT_LID_MODEL = os.getenv("FASTTEXT_LID_MODEL", "lid.176.ftz")
+_ft_model = None
+_ft_checked = False
+_ft_lock = threading.Lock()
+
+
+def _get_fasttext_model():
+    global _ft_model, _ft_checked
+    if _ft_checked:
+        return _ft_model
+    with _ft_lock:
+        if not _ft_checked:
+            if fasttext is not None and os.path.exists(FASTTEXT_LID_MODEL):
+                try:
+                    _ft_model = fasttext.load_model(FASTTEXT_LID_MODEL)
+                    logger.info(f"Language ID: fastText model loaded from {FASTTEXT_LID_MODEL}")
+                except Exception as e:
+                    logger.warning(f"Language ID: fastText load failed ({e}); using langdetect")
+            _ft_checked = True
+    return _ft_model
+
+
+def detect_language(query: str) -> str:
+    """ISO 639-1 code for query; fastText when available, langdetect otherwise."""
+    if len(query) < 3 and query.isascii():
+        return "en"
+
+    model = _get_fasttext_model()
+    if model is not None:
+        try:
+            labels, _ = model.predict(query.replace("\n", " "), k=1)
+            return labels[0].replace("__label__", "")
+        except Exception:
+            pass
+    return detect(query)
 
 
 SUPPORTED_LANGS = {"hi", "zh", "ar", "fr", "es", "ru", "de", "ja", "ko"}
 
+# Argos translation objects per source language (None if the pair isn't installed)
+_PIPELINES = {}
+
+def _get_pipeline(src: str):
+    if src not in _PIPELINES:
+        langs = translate.get_installed_languages()
+        source = next((l for l in langs if l.code == src), None)
+        target = next((l for l in langs if l.code == "en"), None)
+        _PIPELINES[src] = source.get_translation(target) if source and target else None
+    return _PIPELINES[src]
+
+# Common fr/es/de function words. A query containing one is sent through
+# detection even when it is (almost) pure ASCII: "guerre en ukraine",
+# "elecciones en mexico", "wahlen in berlin".
+FOREIGN_FUNCTION_WORDS = frozenset({
+    # fr
+    "le", "la", "les", "des", "du", "de", "en", "et", "un", "une", "au", "aux",
+    "dans", "pour", "avec", "sur", "à",
+    # es
+    "el", "los", "las", "del", "y", "una", "por", "para", "con", "sobre",
+    # de
+    "der", "die", "das", "den", "dem", "und", "ein", "eine", "im", "mit",
+    "von", "zu", "bei", "nach", "für", "über",
+})
+
+# Share of non-ASCII characters above which a query is always detected
+# (below it, e.g. English with one accented name, it is treated as English)
+NON_ASCII_DETECT_RATIO = 0.2
+
+
+def _looks_english(query: str) -> bool:
+    """Cheap pre-check that lets plain English queries skip language detection."""
+    if not query:
+        return True
+    if not query.isascii():
+        non_ascii = sum(1 for c in query if ord(c) > 127)
+        if non_ascii / len(query) > NON_ASCII_DETECT_RATIO:
+            return False
+    return FOREIGN_FUNCTION_WORDS.isdisjoint(query.lower().split())
+
+
 def translate_query_if_needed(query: str) -> dict:
     """
     Deterministically translate query to English if needed.
     Returns both original and translated query.
+    Results are memoized per query string.
     """
+    # Plain English queries are returned without running detection
+    if _looks_english(query):
+        return {
+            "original_query": query,
+            "translated_query": query,
+            "detected_language": "en"
+        }
+    return dict(_translate_cached(query))
+
 
+@lru_cache(maxsize=1024)
+def _translate_cached(query: str) -> dict:
     result = {
         "original_query": query,
         "translated_query": query,
@@ -17,13 +121,14 @@ def translate_query_if_needed(query: str) -> dict:
     }
 
     try:
-        lang = detect(query)
+        lang = detect_language(query)
         result["detected_language"] = lang
 
         if lang != "en" and lang in SUPPORTED_LANGS:
             try:
                 # Attempt translation
-                translated = translate.translate(query, lang, "en")
+                pipeline = _get_pipeline(lang)
+                translated = pipeline.translate(query) if pipeline else None
                 if translated and isinstance(translated, str):
                     result["translated_query"] = translated.strip()
             except Exception:
@@ -1,54 +1,169 @@
-from app.services.intelli_search.bge_reranker import rerank_with_bge
+from app.services.intelli_search.bge_reranker import get_bge_reranker, rerank_with_bge
 from app.services.intelli_search.is_about_validator import is_article_about_query
-from app.services.intelli_search.entity_dominance import entity_dominance_score
-from datetime import datetime, timedelta
+from app.services.intelli_search.entity_dominance import multi_entity_dominance
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 import logging
+import os
+import re
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 # Lazy loading - only initialize when first needed
 _ranker = None
 
+# FlashRank ships this model as an int8-quantized ONNX graph (*_Q.onnx)
+FLASHRANK_MODEL = "ms-marco-MiniLM-L-12-v2"
+
+def _tune_ranker_session(ranker):
+    """
+    Rebuild FlashRank's ONNX Runtime session with full graph optimization and
+    an explicit intra-op thread count (FlashRank uses the ORT defaults).
+    Keeps the stock session if anything goes wrong.
+    """
+    try:
+        import onnxruntime as ort
+        from flashrank.Config import model_file_map
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        opts.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
+        ranker.session = ort.InferenceSession(
+            str(ranker.model_dir / model_file_map[FLASHRANK_MODEL]),
+            sess_options=opts,
+            providers=["CPUExecutionProvider"]
+        )
+    except Exception as e:
+        logger.warning(f"FlashRank session tuning skipped: {e}")
+
 def _get_ranker():
     """Lazy load FlashRank to avoid blocking server startup"""
     global _ranker
     if _ranker is None:
         from flashrank import Ranker
         logger.info("Loading FlashRank model (first search)...")
-        _ranker = Ranker(model_name="ms-marco-MiniLM-L-12-v2")
+        ranker = Ranker(model_name=FLASHRANK_MODEL)
+        _tune_ranker_session(ranker)
+        _ranker = ranker
         logger.info("FlashRank model loaded successfully")
     return _ranker
 
+def warmup():
+    """Load FlashRank and the BGE cross-encoder ahead of the first search."""
+    _get_ranker()
+    get_bge_reranker()
+
 # Semantic gate thresholds
 MIN_CATEGORY_CONFIDENCE = 0.3  # ENABLED: Now that category_confidence is fixed in pipeline
 MIN_ENTITY_DOMINANCE = 0.005   # Penalize if entity appears <0.5% of the time
 APPLY_IS_ABOUT_TO_TOP_N = 15   # Increased: Check deeper for relevance if top matches are noisy
 
-def calculate_recency_boost(published_date):
+# Shared pool for Gate 3 is-about checks (I/O-bound LLM calls)
+GATE3_MAX_WORKERS = 8
+_gate3_pool = ThreadPoolExecutor(max_workers=GATE3_MAX_WORKERS)
+
+# Stage 2 (BGE) candidate pool: 15 by default; machines with spare cores score
+# a deeper pool (up to 4x top_k, capped) since the pairs run as one batch.
+BGE_CANDIDATES = 15
+BGE_CANDIDATES_MAX = 60
+BGE_BATCH_SIZE = 32
+_BGE_DEEP_POOL = (os.cpu_count() or 1) >= 8
+
+# Article fields used to build reranker / gate text
+TEXT_FIELDS = ("title", "translated_title", "summary", "translated_summary", "cleaned_text")
+
+def _get_text_safe(val):
+    """String form of a possibly multilingual field ({"value": ...} / {"en": ...})."""
+    if isinstance(val, dict):
+        return str(val.get("value") or val.get("en") or next(iter(val.values())) if val else "")
+    return str(val) if val else ""
+
+def _doc_texts(doc, cache):
+    """
+    Extracted TEXT_FIELDS for a document, computed once per rerank call.
+    Keyed by _id so the BGE result copies of a document hit the same entry.
+    """
+    key = doc.get("_id", id(doc))
+    texts = cache.get(key)
+    if texts is None:
+        get = doc.get
+        texts = {field: _get_text_safe(get(field)) for field in TEXT_FIELDS}
+        cache[key] = texts
+    return texts
+
+def _gate_text(texts, snippet_len):
+    """Title + summaries + a snippet of the full text, as checked by Gates 2 and 3."""
+    return " ".join(filter(None, (
+        texts["title"],
+        texts["translated_title"],
+        texts["summary"],
+        texts["translated_summary"],
+        texts["cleaned_text"][:snippet_len]
+    )))
+
+# (max age in days, multiplier); anything older gets RECENCY_OLD_MULTIPLIER
+RECENCY_TIERS = ((1, 1.2), (7, 1.1), (30, 1.0))
+RECENCY_OLD_MULTIPLIER = 0.9
+
+def calculate_recency_boost(published_date, today_ord=None):
     """
     Calculate recency boost multiplier based on article age.
     Recent articles get higher scores for time-sensitive queries.
+
+    Age is counted in whole calendar days via date ordinals; pass
+    today_ord (datetime.utcnow().toordinal()) to reuse it across a batch.
+    ISO strings are read from their YYYY-MM-DD prefix only.
     """
     if not published_date:
         return 1.0  # No boost/penalty if date unknown
     
     try:
+        if today_ord is None:
+            today_ord = datetime.utcnow().toordinal()
+
         if isinstance(published_date, str):
-            published_date = datetime.fromisoformat(published_date.replace('Z', '+00:00'))
+            s = published_date
+            pub_ord = date(int(s[0:4]), int(s[5:7]), int(s[8:10])).toordinal()
+        else:
+            pub_ord = published_date.toordinal()
         
-        days_old = (datetime.utcnow() - published_date).days
+        days_old = today_ord - pub_ord
         
-        if days_old <= 1:
-            return 1.2  # 20% boost for today's news
-        elif days_old <= 7:
-            return 1.1  # 10% boost for this week
-        elif days_old <= 30:
-            return 1.0  # No boost for this month
-        else:
-            return 0.9  # 10% penalty for old news
+        for max_days, multiplier in RECENCY_TIERS:
+            if days_old <= max_days:
+                return multiplier
+        return RECENCY_OLD_MULTIPLIER  # 10% penalty for old news
     except Exception:
         return 1.0  # Default to no boost on error
 
+# Generic queries skip Gate 3 (is-about validation)
+_GENERIC_TERMS = frozenset({"sports", "news", "football", "basketball", "technology",
+                            "business", "politics", "entertainment", "science"})
+_GENERIC_PHRASES = frozenset({"sports news", "football news", "tech news", "business news"})
+# Whole words (plural allowed): "attacks paris" is specific, "bitcoin price" is not
+_SPECIFIC_RE = re.compile(r"\b(in|at|from|about|attack|disaster|road|highway|infrastructure|china|india)s?\b")
+
+def is_specific_query(q):
+    """
+    Determine if query is specific enough to warrant is-about validation.
+    Generic queries: "sports", "news", "football" -> Skip Gate 3
+    Specific queries: "roads in china", "terrorist attacks in paris" -> Apply Gate 3
+    """
+    q_lower = q.lower()
+    
+    # Generic single-word queries / two-word phrases
+    if q_lower in _GENERIC_TERMS or q_lower in _GENERIC_PHRASES:
+        return False
+    
+    # If query has specific entities or multiple words with context, it's specific
+    if len(q_lower.split()) >= 3:  # "roads in china" = 3 words
+        return True
+    
+    # If query has location/entity keywords, it's specific
+    return _SPECIFIC_RE.search(q_lower) is not None
+
 def is_broad_category_query(query: str, q_signals: dict = None) -> bool:
     """
     Detect if user is asking for ALL articles in a category.
@@ -89,29 +204,30 @@ def rerank(query: str, documents: list, top_k: int = 5, q_signals: dict = None)
     if not documents:
         return []
 
+    # Per-document gate logging is only formatted when DEBUG is enabled
+    debug = logger.isEnabledFor(logging.DEBUG)
+
     # print(f"DEBUG: documents[0] type: {type(documents[0])}")
 
+    text_cache = {}
     passages = []
     valid_documents = []
     for i, doc in enumerate(documents):
         if not isinstance(doc, dict):
-            print(f"WARNING: Skipping non-dict document: {type(doc)} | Content: {str(doc)[:100]}")
+            logger.warning("Skipping non-dict document: %s | Content: %.100s", type(doc), doc)
             continue
-            
-        def _get_text_safe(val):
-            if isinstance(val, dict):
-                return str(val.get("value") or val.get("en") or list(val.values())[0] if val else "")
-            return str(val) if val else ""
-
-        text = " ".join(filter(None, [
-            _get_text_safe(doc.get("translated_title")),
-            _get_text_safe(doc.get("summary")),
-            _get_text_safe(doc.get("translated_summary")),
-            _get_text_safe(doc.get("cleaned_text"))
-        ]))
+
+        # One passage per document, shared by FlashRank and BGE
+        texts = _doc_texts(doc, text_cache)
+        texts["passage"] = " ".join(filter(None, [
+            texts["translated_title"],
+            texts["summary"],
+            texts["translated_summary"],
+            texts["cleaned_text"]
+        ]))[:1000]
         passages.append({
             "id": len(valid_documents),
-            "text": text[:1000]
+            "text": texts["passage"]
         })
         valid_documents.append(doc)
 
@@ -143,40 +259,28 @@ def rerank(query: str, documents: list, top_k: int = 5, q_signals: dict = None)
     # if flashrank_docs:
     #    print(f"DEBUG: First FlashRank score: {flashrank_docs[0].get('_flash_score')}")
 
-    # Sort and take top 15 for deep reranking
+    # Sort and take the top candidates for deep reranking
     flashrank_docs.sort(key=lambda x: x["_final_score"], reverse=True)
-    bge_candidates_raw = flashrank_docs[:15]
+    bge_pool = BGE_CANDIDATES
+    if _BGE_DEEP_POOL:
+        bge_pool = max(BGE_CANDIDATES, min(top_k * 4, BGE_CANDIDATES_MAX))
+    bge_candidates_raw = flashrank_docs[:bge_pool]
     
     # print(f"DEBUG: bge_candidates_raw type: {type(bge_candidates_raw)}")
     # if bge_candidates_raw:
     #     print(f"DEBUG: bge_candidates_raw[0] type: {type(bge_candidates_raw[0])}")
 
     # --- Stage 2: BGE Cross-Encoder ---
-    bge_candidates = []
-    for doc in bge_candidates_raw:
-        try:
-            # Define safe extraction helper again or move to outer scope if needed, 
-            # but for minimizing diffs, I'll inline the logic or re-use if possible. 
-            # Ideally, I should have defined it outside. Let's do simple dict check here.
-            
-            def _get_text_s(val):
-                if isinstance(val, dict):
-                    return str(val.get("value") or val.get("en") or list(val.values())[0] if val else "")
-                return str(val) if val else ""
-
-            title = _get_text_s(doc.get("translated_title"))
-            summary = _get_text_s(doc.get("translated_summary")) or _get_text_s(doc.get("summary"))
-            bge_candidates.append({
-                "text": f"{title} {summary}",
-                "metadata": doc
-            })
-        except Exception as e:
-            print(f"ERROR Stage 2: doc={type(doc)}, err={e}")
+    bge_candidates = [
+        {"text": _doc_texts(doc, text_cache)["passage"], "metadata": doc}
+        for doc in bge_candidates_raw
+    ]
 
     bge_results = rerank_with_bge(
         query=query,
         documents=bge_candidates,
-        top_k=top_k * 2  # Get more candidates for filtering
+        top_k=top_k * 2,  # Get more candidates for filtering
+        batch_size=BGE_BATCH_SIZE
     )
 
     # --- Stage 3: SEMANTIC GATES (NEW) ---
@@ -186,34 +290,31 @@ def rerank(query: str, documents: list, top_k: int = 5, q_signals: dict = None)
         title = result.get('translated_title') or result.get('title') or 'Untitled'
         return str(title)[:60]
     
-    # Gate 1: Category Confidence Enforcement
+    # Gate 1: Category Confidence Enforcement (masked over the whole candidate set;
+    # a missing/None confidence counts as 0.0)
     filtered_results = []
-    for result in bge_results:
-        category_confidence = result.get("category_confidence", 0.0)
-        article_category = result.get("category", "")
-        
-        # Determine if we should be lenient (e.g. if category matches query intent)
-        # If the search specifically filtered for this category, we trust it even if confidence is 0.0
-        # (Confidence 0.0 often means it's not a disaster, but it can still be a valid news category)
-        is_trusted_category = False
-        if article_category and article_category != "unknown":
-            is_trusted_category = True
-            
-        # Strict rejection ONLY if confidence is low AND it's not a trusted category
-        if category_confidence < MIN_CATEGORY_CONFIDENCE:
-            if not is_trusted_category:
-                print(f"GATE 1 REJECT: Low category confidence ({category_confidence:.2f}) for: {safe_title(result)}")
-                continue
-            else:
-                # Keep it but apply a small penalty if confidence is 0.0
-                if category_confidence == 0.0:
-                    result["bge_score"] = result.get("bge_score", 0) * 0.8
-                    print(f"GATE 1 CAUTION: Zero confidence but trusted category '{article_category}' for: {safe_title(result)}")
-        
-        # Penalty for moderate confidence
-        elif category_confidence < 0.5:
-            result["bge_score"] = result.get("bge_score", 0) * 0.9
-        
+    n = len(bge_results)
+    conf = np.fromiter((r.get("category_confidence", 0.0) or 0.0 for r in bge_results), dtype=np.float64, count=n)
+    trusted = np.fromiter(
+        (bool(r.get("category")) and r.get("category") != "unknown" for r in bge_results), dtype=bool, count=n
+    )
+    low = conf < MIN_CATEGORY_CONFIDENCE
+    # Strict rejection ONLY if confidence is low AND it's not a trusted category;
+    # trusted zero-confidence articles get a small penalty, moderate confidence a smaller one
+    keep = ~low | trusted
+    multiplier = np.select([low & (conf == 0.0), ~low & (conf < 0.5)], [0.8, 0.9], 1.0)
+
+    if debug:
+        for i in np.flatnonzero(~keep):
+            logger.debug("GATE 1 REJECT: Low category confidence (%.2f) for: %s", conf[i], safe_title(bge_results[i]))
+        for i in np.flatnonzero(keep & low & (conf == 0.0)):
+            logger.debug("GATE 1 CAUTION: Zero confidence but trusted category '%s' for: %s",
+                         bge_results[i].get("category", ""), safe_title(bge_results[i]))
+
+    for i in np.flatnonzero(keep):
+        result = bge_results[i]
+        if multiplier[i] != 1.0:
+            result["bge_score"] = result.get("bge_score", 0) * float(multiplier[i])
         filtered_results.append(result)
     
     # Gate 2: Entity Dominance Penalty
@@ -240,122 +341,73 @@ def rerank(query: str, documents: list, top_k: int = 5, q_signals: dict = None)
     if ("terror" in query_lower or "attack" in query_lower) and "attack" not in key_entities:
         key_entities.append("attack")
     
-    for result in filtered_results:
-        # Safely build article text with all available fields (FIX: Added title and cleaned_text)
-        # Helper for safe text extraction
-        def _get_text_s(val):
-            if isinstance(val, dict):
-                return str(val.get("value") or val.get("en") or list(val.values())[0] if val else "")
-            return str(val) if val else ""
-
-        # Safely build article text with all available fields (FIX: Added title and cleaned_text)
-        article_text = " ".join(filter(None, [
-            _get_text_s(result.get("title")),  # Original title fallback
-            _get_text_s(result.get("translated_title")),
-            _get_text_s(result.get("summary")),
-            _get_text_s(result.get("translated_summary")),
-            _get_text_s(result.get("cleaned_text"))[:500] # Use snippet of full text
-        ]))
-        
+    # Gate 2 penalty and recency boost are both multipliers: collect them per
+    # document, apply them to the score vector at once and sort by argsort.
+    today_ord = datetime.utcnow().toordinal()
+    n_results = len(filtered_results)
+    scores = np.fromiter((r.get("bge_score", 0) for r in filtered_results), dtype=np.float64, count=n_results)
+    penalty = np.ones(n_results)
+    recency = np.ones(n_results)
+
+    for i, result in enumerate(filtered_results):
         # Calculate entity dominance
         if key_entities:
-            dominance_scores = [entity_dominance_score(entity, article_text) for entity in key_entities]
-            avg_dominance = sum(dominance_scores) / len(dominance_scores) if dominance_scores else 0
+            # Safely build article text with all available fields (FIX: Added title and cleaned_text)
+            article_text = _gate_text(_doc_texts(result, text_cache), 500)  # Use snippet of full text
+            avg_dominance = multi_entity_dominance(key_entities, article_text)
             
             # Penalize if entity is barely mentioned
             if avg_dominance < MIN_ENTITY_DOMINANCE:
-                result["bge_score"] = result.get("bge_score", 0) * 0.5
-                print(f"GATE 2 PENALTY: Low entity dominance ({avg_dominance:.4f}) for: {safe_title(result)}")
-    
-    # Re-sort after penalties
-    filtered_results.sort(key=lambda x: x.get("bge_score", 0), reverse=True)
-    
-    # OPTIMIZATION: Apply recency boost to prioritize recent articles
-    for result in filtered_results:
-        published_date = result.get("published_date")
-        recency_multiplier = calculate_recency_boost(published_date)
-        
-        # Apply boost to final score
-        original_score = result.get("bge_score", 0)
-        result["bge_score"] = original_score * recency_multiplier
-        
-        if recency_multiplier != 1.0:
-            print(f"RECENCY BOOST: {recency_multiplier:.2f}x for: {safe_title(result)}")
-    
-    # Re-sort after recency boost
-    filtered_results.sort(key=lambda x: x.get("bge_score", 0), reverse=True)
+                penalty[i] = 0.5
+                if debug:
+                    logger.debug("GATE 2 PENALTY: Low entity dominance (%.4f) for: %s", avg_dominance, safe_title(result))
+
+        # OPTIMIZATION: Apply recency boost to prioritize recent articles
+        recency[i] = calculate_recency_boost(result.get("published_date"), today_ord)
+        if debug and recency[i] != 1.0:
+            logger.debug("RECENCY BOOST: %.2fx for: %s", recency[i], safe_title(result))
+
+    scores *= penalty * recency
+
+    # Re-sort after penalties and recency boost (stable, highest first)
+    order = np.argsort(-scores, kind="stable")
+    filtered_results = [filtered_results[i] for i in order]
+    for result, score in zip(filtered_results, scores[order].tolist()):
+        result["bge_score"] = score
     
     # Gate 3: Is-About Validator (Apply only to SPECIFIC queries, not generic ones)
     # Skip Gate 3 for generic queries like "sports news", "football", "technology"
-    def is_specific_query(q):
-        """
-        Determine if query is specific enough to warrant is-about validation.
-        Generic queries: "sports", "news", "football" -> Skip Gate 3
-        Specific queries: "roads in china", "terrorist attacks in paris" -> Apply Gate 3
-        """
-        q_lower = q.lower()
-        
-        # Generic single-word queries
-        generic_terms = ["sports", "news", "football", "basketball", "technology", 
-                        "business", "politics", "entertainment", "science"]
-        if q_lower in generic_terms:
-            return False
-        
-        # Generic two-word queries
-        generic_phrases = ["sports news", "football news", "tech news", "business news"]
-        if q_lower in generic_phrases:
-            return False
-        
-        # If query has specific entities or multiple words with context, it's specific
-        words = q_lower.split()
-        if len(words) >= 3:  # "roads in china" = 3 words
-            return True
-        
-        # If query has location/entity keywords, it's specific
-        specific_keywords = ["in", "at", "from", "about", "attack", "disaster", 
-                            "road", "highway", "infrastructure", "china", "india"]
-        if any(keyword in q_lower for keyword in specific_keywords):
-            return True
-        
-        return False
-    
     final_results = []
     
     # 🎯 BYPASS GATES for broad category queries (e.g., "all disaster news")
     if is_broad_category_query(query, q_signals):
-        print(f"🎯 BROAD CATEGORY QUERY: Bypassing GATE 3 - returning all category matches")
+        logger.debug("🎯 BROAD CATEGORY QUERY: Bypassing GATE 3 - returning all category matches")
         return filtered_results[:top_k]
     
     # Only apply Gate 3 if query is specific
     if is_specific_query(query):
-        print(f"GATE 3 ACTIVE: Query is specific, applying is-about validation")
-        for i, result in enumerate(filtered_results[:APPLY_IS_ABOUT_TO_TOP_N]):
-            # Helper for safe text extraction
-            def _get_text_s(val):
-                if isinstance(val, dict):
-                    return str(val.get("value") or val.get("en") or list(val.values())[0] if val else "")
-                return str(val) if val else ""
-
-            # Use same robust text builder
-            article_text = " ".join(filter(None, [
-                _get_text_s(result.get("title")),
-                _get_text_s(result.get("translated_title")),
-                _get_text_s(result.get("summary")),
-                _get_text_s(result.get("translated_summary")),
-                _get_text_s(result.get("cleaned_text"))[:800] # Slightly larger snippet for LLM
-            ]))
-            
-            # Binary entailment check
-            if is_article_about_query(query, article_text):
+        logger.debug("GATE 3 ACTIVE: Query is specific, applying is-about validation")
+        gate3_candidates = filtered_results[:APPLY_IS_ABOUT_TO_TOP_N]
+        # Use same robust text builder (slightly larger snippet for LLM)
+        gate3_texts = [_gate_text(_doc_texts(result, text_cache), 800) for result in gate3_candidates]
+
+        # Binary entailment checks are independent Ollama calls: run them
+        # concurrently, verdicts come back in candidate order
+        verdicts = _gate3_pool.map(is_article_about_query, [query] * len(gate3_texts), gate3_texts)
+
+        for result, is_about in zip(gate3_candidates, verdicts):
+            if is_about:
                 final_results.append(result)
-                print(f"GATE 3 PASS: Is-about validated for: {safe_title(result)}")
+                if debug:
+                    logger.debug("GATE 3 PASS: Is-about validated for: %s", safe_title(result))
             else:
-                print(f"GATE 3 REJECT: Not primarily about query: {safe_title(result)}")
+                if debug:
+                    logger.debug("GATE 3 REJECT: Not primarily about query: %s", safe_title(result))
         
         # Add remaining results without is-about check (already filtered by gates 1 & 2)
         final_results.extend(filtered_results[APPLY_IS_ABOUT_TO_TOP_N:top_k])
     else:
-        print(f"GATE 3 SKIPPED: Query is generic, returning all filtered results")
+        logger.debug("GATE 3 SKIPPED: Query is generic, returning all filtered results")
         final_results = filtered_results[:top_k]
     
     return final_results[:top_k]
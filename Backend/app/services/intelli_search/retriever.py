@@ -1,6 +1,14 @@
 from flask import current_app
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from operator import itemgetter
+import logging
+
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
 
 def _regex_any(terms):
     """Create a safe OR-regex for multiple terms"""
@@ -15,9 +23,33 @@ def _regex_any(terms):
 # Search Version: v1.0-search (HyDE + Atlas Vector + FlashRank + BGE Rerank)
 from app.services.intelli_search.category_scorer import score_categories_with_llm
 from app.services.intelli_search.vector_retriever import vector_search
-from app.services.intelli_search.ollama_client import get_ollama_llm
 from app.services.intelli_search.hyde_generator import generate_hypothetical_answer
 
+# CATEGORY MAPPING: LLM suggestions -> actual DB categories
+# Database has: ['aircraft', 'disaster', 'infrastructure', 'terror']
+VALID_DB_CATEGORIES = frozenset({"aircraft", "disaster", "infrastructure", "terror"})
+CATEGORY_MAP = {
+    'transportation': 'infrastructure',
+    'transport': 'infrastructure',
+    'roads': 'infrastructure',
+    'highways': 'infrastructure',
+    'construction': 'infrastructure',
+    'building': 'infrastructure',
+    'development': 'infrastructure',
+    'security': 'terror',
+    'attack': 'terror',
+    'terrorism': 'terror',
+    'violence': 'terror',
+    'natural disaster': 'disaster',
+    'earthquake': 'disaster',
+    'flood': 'disaster',
+    'storm': 'disaster',
+    'aviation': 'aircraft',
+    'flight': 'aircraft',
+    'plane': 'aircraft',
+    'airport': 'aircraft'
+}
+
 def apply_dynamic_category_boost(candidates, query_context):
     if not candidates: return []
     query = query_context.get("canonical_query") or query_context["original_query"]
@@ -65,45 +97,82 @@ def apply_dynamic_category_boost(candidates, query_context):
     boosted.sort(key=lambda x: x["boosted_score"], reverse=True)
     return boosted
 
+LEXICAL_FIELDS = ("keywords", "entities.text", "translated_title", "title")
+
+# Fields the reranker, explanations and result cards use. cleaned_text is cut
+# server-side to the longest snippet the reranker reads (non-strings untouched).
+CLEANED_TEXT_CHARS = 1000
+_ARTICLE_PROJECTION = {
+    **{field: 1 for field in (
+        "title", "translated_title", "summary", "translated_summary",
+        "keywords", "entities", "category", "inferred_category", "category_confidence",
+        "country", "continent", "city", "published_date", "created_at",
+        "source", "original_url", "image_url", "language", "status"
+    )},
+    "cleaned_text": {"$cond": [
+        {"$eq": [{"$type": "$cleaned_text"}, "string"]},
+        {"$substrCP": ["$cleaned_text", 0, CLEANED_TEXT_CHARS]},
+        "$cleaned_text"
+    ]}
+}
+LEXICAL_STATUS_FILTER = {"status": {"$in": ["partial", "fully_analyzed"]}}
+
+@lru_cache(maxsize=256)
+def _build_lex_or(query_text):
+    """$or clause for the regex fallback; the query is escaped once and matched literally."""
+    pattern = re.escape(query_text)
+    return tuple({field: {"$regex": pattern, "$options": "i"}} for field in LEXICAL_FIELDS)
+
 def lexical_search(collection, query_text, limit=50):
-    results = list(collection.find(
-        {
-            "$or": [
-                {"keywords": {"$regex": query_text, "$options": "i"}},
-                {"entities.text": {"$regex": query_text, "$options": "i"}},
-                {"translated_title": {"$regex": query_text, "$options": "i"}},
-                {"title": {"$regex": query_text, "$options": "i"}}
-            ],
-            "status": {"$in": ["partial", "fully_analyzed"]}
-        }
-    ).limit(limit))
+    """
+    Keyword stream. Uses the ArticleTextIndex ($text) as a phrase search,
+    ranked by textScore; falls back to unanchored regexes (collection scan)
+    when the text index is unavailable.
+    """
+    query_text = (query_text or "").strip()
+    if not query_text:
+        return []
+
+    # Quoted: the whole query must appear as a phrase, like the regex did
+    # (the index has no stop-word list, so unquoted terms would OR on "in")
+    phrase = '"' + query_text.replace('"', " ") + '"'
+    try:
+        results = list(collection.find(
+            {"$text": {"$search": phrase}, **LEXICAL_STATUS_FILTER},
+            {**_ARTICLE_PROJECTION, "_text_score": {"$meta": "textScore"}}
+        ).sort([("_text_score", {"$meta": "textScore"})]).limit(limit).batch_size(limit))
+    except OperationFailure as e:
+        logger.warning(f"Text search unavailable, using regex lexical search: {e}")
+        results = list(collection.find(
+            {"$or": list(_build_lex_or(query_text)), **LEXICAL_STATUS_FILTER},
+            _ARTICLE_PROJECTION
+        ).limit(limit).batch_size(limit))
     
     for doc in results:
         doc["lexical_match"] = True
     return results
 
 def fuse_results(vector_docs, lexical_docs):
+    # Documents are fresh from Mongo, so scores are written in place rather
+    # than copying each document into a new dict.
     fused = {}
 
     # Vector results dominate recall (using previously retrieved structured results as vector proxy)
     for doc in vector_docs:
-        fused[str(doc["_id"])] = {
-            **doc,
-            "score": doc.get("score", 1.0) * 0.7
-        }
+        doc["score"] = doc.get("score", 1.0) * 0.7
+        fused[str(doc["_id"])] = doc
 
     # Lexical results add precision
     for doc in lexical_docs:
         doc_id = str(doc["_id"])
-        if doc_id in fused:
-            fused[doc_id]["score"] += 0.3
+        existing = fused.get(doc_id)
+        if existing is not None:
+            existing["score"] += 0.3
         else:
-            fused[doc_id] = {
-                **doc,
-                "score": 0.3
-            }
+            doc["score"] = 0.3
+            fused[doc_id] = doc
 
-    return sorted(fused.values(), key=lambda x: x["score"], reverse=True)
+    return sorted(fused.values(), key=itemgetter("score"), reverse=True)
 
 def retrieve_candidates(processed_query: dict, limit: int = 50) -> list:
     """
@@ -135,57 +204,30 @@ def retrieve_candidates(processed_query: dict, limit: int = 50) -> list:
     if isinstance(categories, str): categories = [categories]
     
     # CATEGORY MAPPING: Translate LLM suggestions to actual DB categories
-    # Database has: ['aircraft', 'disaster', 'infrastructure', 'terror']
-    CATEGORY_MAP = {
-        'transportation': 'infrastructure',
-        'transport': 'infrastructure',
-        'roads': 'infrastructure',
-        'highways': 'infrastructure',
-        'construction': 'infrastructure',
-        'building': 'infrastructure',
-        'development': 'infrastructure',
-        'security': 'terror',
-        'attack': 'terror',
-        'terrorism': 'terror',
-        'violence': 'terror',
-        'natural disaster': 'disaster',
-        'earthquake': 'disaster',
-        'flood': 'disaster',
-        'storm': 'disaster',
-        'aviation': 'aircraft',
-        'flight': 'aircraft',
-        'plane': 'aircraft',
-        'airport': 'aircraft'
-    }
-    
-    # Map categories to actual DB values
-    mapped_categories = []
-    for cat in categories:
-        cat_lower = str(cat).lower()
-        # Check if it's already a valid category
-        if cat_lower in ['aircraft', 'disaster', 'infrastructure', 'terror']:
-            mapped_categories.append(cat_lower)
-        # Otherwise try to map it
-        elif cat_lower in CATEGORY_MAP:
-            mapped_categories.append(CATEGORY_MAP[cat_lower])
-            print(f"📋 Mapped category '{cat}' → '{CATEGORY_MAP[cat_lower]}'")
-        else:
-            # Unknown category - include it anyway (might match)
-            mapped_categories.append(cat_lower)
-    
-    categories = list(set(mapped_categories))  # Remove duplicates
+    # (unknown categories are kept as-is - they might match)
+    categories = list({
+        cat_lower if cat_lower in VALID_DB_CATEGORIES else CATEGORY_MAP.get(cat_lower, cat_lower)
+        for cat_lower in (str(cat).lower() for cat in categories)
+    })
     
     continent = entities.get("continent")
     time_window_days = processed_query.get("time_window_days")
     # Build Filters (for both Vector Pre-filtering and Structured fallback)
     structured_or = []
     
-    # Pre-filter for Vector Search (Atlas supports $in for filter fields)
-    vector_filter = {"status": {"$in": ["partial", "fully_analyzed"]}}
+    # Pre-filter for Vector Search (Atlas supports $in for filter fields).
+    # Fixed key set, unset ones dropped below in sorted order, so equivalent
+    # filters always serialize to the same shape.
+    vector_filter = {
+        "status": {"$in": ["partial", "fully_analyzed"]},
+        "category": None,
+        "country": None,
+        "continent": None
+    }
 
     if categories:
         # Vector filter: Use $in with lowercase (Atlas vector search requirement)
-        cat_list = [str(c).lower() for c in categories]
+        cat_list = sorted({str(c).lower() for c in categories})
         vector_filter["category"] = {"$in": cat_list}
         
         # Structured filter: Use case-insensitive regex for flexibility
@@ -218,17 +260,21 @@ def retrieve_candidates(processed_query: dict, limit: int = 50) -> list:
         # Structured filter: Use case-insensitive regex
         structured_or.append({"continent": {"$regex": re.escape(continent_lower), "$options": "i"}})
 
+    vector_filter = {k: vector_filter[k] for k in sorted(vector_filter) if vector_filter[k] is not None}
+
     # ---------------------------
     # Stream 1: AI Vector Search (Semantic)
     # ---------------------------
     query_text = processed_query.get("canonical_query") or processed_query.get("original_query") or ""
-    vector_docs = []
-    
-    # Try high-accuracy vector search with metadata pre-filtering (using HyDE)
-    if query_text:
+
+    def semantic_stream():
+        # Try high-accuracy vector search with metadata pre-filtering (using HyDE)
+        if not query_text:
+            return []
+
         # Generate hypothetical answer to align query semantics with manual news articles
-        llm = get_ollama_llm()
-        hyde_text = generate_hypothetical_answer(query_text, llm)
+        # (memoized per normalized query inside the generator)
+        hyde_text = generate_hypothetical_answer(query_text)
         
         # Safety fallback
         if not hyde_text or len(hyde_text) < 20:
@@ -237,7 +283,18 @@ def retrieve_candidates(processed_query: dict, limit: int = 50) -> list:
         print(f"HyDE Output: {hyde_text}")
         
         # We pass the vector_filter to ensure we search ONLY within relevant topics/locations
-        vector_docs = vector_search(hyde_text, limit=limit, pre_filter=vector_filter)
+        return vector_search(hyde_text, limit=limit, pre_filter=vector_filter)
+
+    # ---------------------------
+    # Stream 2: Lexical Search (Keyword Exact Match)
+    # ---------------------------
+    # The two streams are independent, so the lexical Mongo query runs while
+    # HyDE waits on Ollama instead of after it.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        semantic_future = executor.submit(semantic_stream)
+        lexical_future = executor.submit(lexical_search, articles, query_text, limit)
+        vector_docs = semantic_future.result()
+        lexical_docs = lexical_future.result()
     
     # 1B. Fallback with Structured search if vector search is empty or filtered too strictly
     if not vector_docs and structured_or:
@@ -254,22 +311,16 @@ def retrieve_candidates(processed_query: dict, limit: int = 50) -> list:
             time_query = {
                 "$and": base_query["$and"] + [{"created_at": {"$gte": cutoff}}]
             }
-            vector_docs = list(articles.find(time_query).sort("published_date", -1).limit(limit))
+            vector_docs = list(articles.find(time_query, _ARTICLE_PROJECTION).sort("published_date", -1).limit(limit))
             # Fallback if time query yields nothing
             if not vector_docs:
-                vector_docs = list(articles.find(base_query).sort("published_date", -1).limit(limit))
+                vector_docs = list(articles.find(base_query, _ARTICLE_PROJECTION).sort("published_date", -1).limit(limit))
         else:
-             vector_docs = list(articles.find(base_query).sort("published_date", -1).limit(limit))
+             vector_docs = list(articles.find(base_query, _ARTICLE_PROJECTION).sort("published_date", -1).limit(limit))
 
     for doc in vector_docs:
         doc["semantic_match"] = True
 
-    # ---------------------------
-    # Stream 2: Lexical Search (Keyword Exact Match)
-    # ---------------------------
-    query_text = processed_query.get("canonical_query") or processed_query.get("original_query") or ""
-    lexical_docs = lexical_search(articles, query_text, limit=limit)
-
     # ---------------------------
     # Stream 3: Fusion & Safety Net
     # ---------------------------
@@ -282,7 +333,7 @@ def retrieve_candidates(processed_query: dict, limit: int = 50) -> list:
                 {"created_at": {"$gte": recent_cutoff}}
             ]
         }
-        vector_docs = list(articles.find(query).sort("published_date", -1).limit(10))
+        vector_docs = list(articles.find(query, _ARTICLE_PROJECTION).sort("published_date", -1).limit(10))
 
     # Fuse Results
     candidates = fuse_results(vector_docs, lexical_docs)
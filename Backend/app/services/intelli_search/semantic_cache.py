@@ -0,0 +1,82 @@
+"""
+Semantic (near-duplicate) cache.
+
+Keeps normalized embeddings of previous inputs in a fixed-size NumPy ring
+buffer and returns the stored payload when a new input's cosine similarity
+to a live entry reaches the threshold. Entries are evicted FIFO once the
+buffer is full and ignored after their TTL.
+
+An optional tag (e.g. rule-derived signals) must match exactly for a hit,
+so paraphrases only collapse when the cheap deterministic signals agree.
+"""
+
+import copy
+import threading
+import time
+
+import numpy as np
+
+
+class SemanticCache:
+    def __init__(self, threshold: float = 0.95, max_entries: int = 10000, ttl_seconds: float = 3600):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._vectors = None  # allocated on first insert, once the dimension is known
+        self._timestamps = np.zeros(max_entries, dtype=np.float64)
+        self._tags = [None] * max_entries
+        self._payloads = [None] * max_entries
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def lookup(self, vector, tag=None):
+        """Return a copy of the best matching payload, or None."""
+        with self._lock:
+            if self._size == 0:
+                return None
+
+            vec = self._normalize(vector)
+            if vec.shape[0] != self._vectors.shape[1]:
+                return None
+
+            sims = self._vectors[:self._size] @ vec
+            expired = self._timestamps[:self._size] < time.time() - self.ttl_seconds
+            sims[expired] = -np.inf
+
+            # Walk candidates best-first until one has a matching tag
+            for idx in np.argsort(-sims):
+                if sims[idx] < self.threshold:
+                    return None
+                if self._tags[idx] == tag:
+                    return copy.deepcopy(self._payloads[idx])
+            return None
+
+    def add(self, vector, payload, tag=None) -> None:
+        vec = self._normalize(vector)
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != vec.shape[0]:
+                self._vectors = np.zeros((self.max_entries, vec.shape[0]), dtype=np.float32)
+                self._size = 0
+                self._next = 0
+
+            slot = self._next
+            self._vectors[slot] = vec
+            self._timestamps[slot] = time.time()
+            self._tags[slot] = tag
+            self._payloads[slot] = copy.deepcopy(payload)
+
+            self._next = (slot + 1) % self.max_entries
+            self._size = min(self._size + 1, self.max_entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._size = 0
+            self._next = 0
@@ -9,8 +9,19 @@ os.environ['TRANSFORMERS_CACHE'] = os.getenv('TRANSFORMERS_CACHE', r'D:\ML_Model
 
 from pymongo import MongoClient
 from sentence_transformers import SentenceTransformer
-from functools import lru_cache
+from collections import OrderedDict
+from concurrent.futures import Future
+import hashlib
+import json
 import logging
+import math
+import queue
+import sqlite3
+import time
+
+import numpy as np
+
+from app.services.intelli_search.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +30,13 @@ DB_NAME = os.getenv("MONGODB_DB_NAME", "news_sentiment_intelligence_db")
 # COLLECTION_NAME = "articles"
 COLLECTION_NAME = "news_dataset"
 VECTOR_INDEX_NAME = "articles_vector_index"  # FIXED: Match actual Atlas index name
+EMBEDDING_MODEL_NAME = "intfloat/multilingual-e5-large"
+# "onnx" serves query embeddings from an ONNX Runtime export (TensorRT/CUDA
+# when available); documents are always encoded by the PyTorch model.
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+# CPU fallback only: "int8" or "fp16" dynamic quantization of Linear layers
+# ("" keeps FP32). On GPU the model is already loaded in FP16.
+EMBED_QUANT = os.getenv("EMBED_QUANT", "").lower()
 
 client = MongoClient(MONGO_URI)
 db = client[DB_NAME]
@@ -44,26 +62,29 @@ def get_model():
             logger = logging.getLogger(__name__)
             
             if torch.cuda.is_available():
-                # Force "cuda" string to ensure consistent behavior
                 device = "cuda"
-                logger.info(f"🚀 GPU Acceleration detected. Forcing multilingual-e5-large on {device}")
+                logger.info(f"🚀 GPU Acceleration detected. Loading multilingual-e5-large on {device}")
             else:
-                device = "cuda" 
-                logger.warning("🚨 GPU requested but CUDA is not available. System may crash if forced.")
+                device = "cpu"
+                logger.warning("⚠️ CUDA is not available. Falling back to CPU for embeddings (slow).")
 
             # MANUAL LOADING PATTERN (Mimics translation.py stability)
             try:
                 from sentence_transformers import models
                 
-                logger.info("⏳ Manually loading Transformer module on CPU...")
-                model_name = "intfloat/multilingual-e5-large"
+                logger.info("⏳ Manually loading Transformer module...")
+                model_name = EMBEDDING_MODEL_NAME
                 cache_dir = os.getenv("TRANSFORMERS_CACHE", r"D:\ML_Models_Cache\huggingface")
                 
-                # Step 1: underlying transformer
+                # Step 1: underlying transformer. On GPU the weights are materialized
+                # directly in FP16, so there is no FP32 copy to cast down afterwards.
+                model_args = {"low_cpu_mem_usage": True, "device_map": None}
+                if device == "cuda":
+                    model_args["torch_dtype"] = torch.float16
                 word_embedding_model = models.Transformer(
                     model_name, 
                     cache_dir=cache_dir,
-                    model_args={"low_cpu_mem_usage": False, "device_map": None} 
+                    model_args=model_args
                 )
                 
                 # Step 2: Pooling
@@ -78,10 +99,13 @@ def get_model():
                 logger.info(f"🚀 assembling SentenceTransformer and moving to {device}...")
                 _model = SentenceTransformer(modules=[word_embedding_model, pooling_model], device=device)
                 
-                # 🚀 ROOT CAUSE FIX: Quantize to FP16 for 2x speed and 50% less VRAM
-                if device == "cuda":
-                    logger.info("💎 Quantizing Embedding Model to FP16 (Half Precision)...")
-                    _model.half() 
+                # CPU only: optional dynamic quantization of the Linear layers
+                if device == "cpu" and EMBED_QUANT in ("int8", "fp16"):
+                    quant_dtype = torch.qint8 if EMBED_QUANT == "int8" else torch.float16
+                    logger.info(f"💎 Dynamically quantizing embedding Linear layers to {EMBED_QUANT} for CPU...")
+                    torch.quantization.quantize_dynamic(
+                        _model, {torch.nn.Linear}, dtype=quant_dtype, inplace=True
+                    )
                 
                 logger.info(f"✅ Model loaded successfully on {device}")
                 
@@ -91,14 +115,436 @@ def get_model():
                 
     return _model
 
+
+class OnnxEmbedder:
+    """
+    Minimal SentenceTransformer.encode() stand-in backed by an ONNX Runtime
+    export of the same transformer. Mean pooling and L2 normalization match
+    the Pooling module used by get_model() and are done in NumPy.
+    """
+
+    def __init__(self, model, tokenizer, max_length=512):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+
+    def encode(self, sentences, batch_size=32, normalize_embeddings=False, convert_to_numpy=True, **kwargs):
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        chunks = []
+        for start in range(0, len(sentences), batch_size):
+            encoded = self.tokenizer(
+                sentences[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np",
+            )
+            hidden = np.asarray(self.model(**encoded).last_hidden_state, dtype=np.float32)
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if normalize_embeddings:
+                pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            chunks.append(pooled)
+
+        embeddings = np.concatenate(chunks) if chunks else np.empty((0, 0), dtype=np.float32)
+        return embeddings[0] if single else embeddings
+
+
+class TorchEmbedder:
+    """
+    encode() for search queries that drives the SentenceTransformer's modules
+    directly: tokenize into pinned CPU memory, copy to the GPU asynchronously,
+    run the transformer under inference_mode (and fp16 autocast on CUDA), then
+    masked mean-pool and L2-normalize, matching get_model()'s Pooling module.
+    """
+
+    def __init__(self, model):
+        self.st_model = model
+        self.transformer = model[0]
+        self.device = model.device
+
+    def encode(self, sentences, batch_size=32, normalize_embeddings=False, convert_to_numpy=True, **kwargs):
+        import torch
+        import torch.nn.functional as F
+
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        on_cuda = self.device.type == "cuda"
+        chunks = []
+        with torch.inference_mode(), torch.autocast("cuda", dtype=torch.float16, enabled=on_cuda):
+            for start in range(0, len(sentences), batch_size):
+                encoded = self.transformer.tokenizer(
+                    sentences[start:start + batch_size],
+                    padding=True,
+                    truncation=True,
+                    max_length=self.transformer.max_seq_length,
+                    return_tensors="pt",
+                )
+                # int32 ids (nn.Embedding accepts them) halve the host-to-device copy
+                encoded = {k: v.to(torch.int32) for k, v in encoded.items()}
+                if on_cuda:
+                    encoded = {k: v.pin_memory().to(self.device, non_blocking=True) for k, v in encoded.items()}
+                hidden = self.transformer.auto_model(**encoded).last_hidden_state
+                mask = encoded["attention_mask"].unsqueeze(-1).to(torch.float32)
+                pooled = (hidden.float() * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                if normalize_embeddings:
+                    pooled = F.normalize(pooled, p=2, dim=1)
+                chunks.append(pooled)
+
+        embeddings = torch.cat(chunks) if chunks else torch.empty((0, 0))
+        if convert_to_numpy:
+            embeddings = embeddings.cpu().numpy()
+        return embeddings[0] if single else embeddings
+
+
+_query_encoder = None
+_query_encoder_lock = threading.Lock()
+
+def _load_onnx_encoder():
+    """Export (first run) or load the cached ONNX model on the best available provider."""
+    import onnxruntime as ort
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    from transformers import AutoTokenizer
+
+    cache_dir = os.getenv("TRANSFORMERS_CACHE", r"D:\ML_Models_Cache\huggingface")
+    export_dir = os.path.join(cache_dir, "onnx", EMBEDDING_MODEL_NAME.split("/")[-1])
+
+    available = ort.get_available_providers()
+    provider = next(
+        p for p in ("TensorrtExecutionProvider", "CUDAExecutionProvider", "CPUExecutionProvider")
+        if p in available
+    )
+    provider_options = None
+    if provider == "TensorrtExecutionProvider":
+        provider_options = {
+            "trt_fp16_enable": True,
+            "trt_engine_cache_enable": True,
+            "trt_engine_cache_path": os.path.join(export_dir, "trt_cache"),
+        }
+
+    if os.path.isfile(os.path.join(export_dir, "model.onnx")):
+        model = ORTModelForFeatureExtraction.from_pretrained(
+            export_dir, provider=provider, provider_options=provider_options
+        )
+        tokenizer = AutoTokenizer.from_pretrained(export_dir)
+    else:
+        logger.info(f"⏳ Exporting {EMBEDDING_MODEL_NAME} to ONNX (one-time)...")
+        model = ORTModelForFeatureExtraction.from_pretrained(
+            EMBEDDING_MODEL_NAME, export=True, cache_dir=cache_dir,
+            provider=provider, provider_options=provider_options,
+        )
+        tokenizer = AutoTokenizer.from_pretrained(EMBEDDING_MODEL_NAME, cache_dir=cache_dir)
+        model.save_pretrained(export_dir)
+        tokenizer.save_pretrained(export_dir)
+
+    logger.info(f"✅ ONNX query encoder loaded on {provider}")
+    return OnnxEmbedder(model, tokenizer)
+
+def get_query_encoder():
+    """
+    Encoder used for search queries. Returns the ONNX Runtime encoder when
+    EMBEDDING_BACKEND=onnx and optimum/onnxruntime are installed; otherwise
+    (or if the export fails) a TorchEmbedder over the shared get_model().
+    """
+    global _query_encoder
+    with _query_encoder_lock:
+        if _query_encoder is None:
+            if EMBEDDING_BACKEND == "onnx":
+                try:
+                    _query_encoder = _load_onnx_encoder()
+                except Exception as e:
+                    logger.warning(f"ONNX query encoder unavailable ({e}); using PyTorch model")
+            if _query_encoder is None:
+                _query_encoder = TorchEmbedder(get_model())
+    return _query_encoder
+
+
+WARMUP_QUERIES = ["warmup", "latest earthquake news", "election results and government policy"]
+
+def warmup():
+    """
+    Load the query encoder and run a few dummy batches so CUDA kernels (or
+    TensorRT engines) are built before the first real search. Bypasses the
+    embedding caches so nothing is stored for the dummy texts.
+    """
+    get_query_encoder().encode(WARMUP_QUERIES, normalize_embeddings=True, convert_to_numpy=True)
+
+EMBED_CACHE_MAXSIZE = 1000
+EMBED_BATCH_SIZE = 32
+EMBED_BATCH_WAIT_SECONDS = float(os.getenv("EMBED_BATCH_WAIT_MS", "10")) / 1000
+# Second-tier cache that survives restarts; set to "" to disable. Kept next to
+# the model weights (like the ONNX export) rather than in the working directory.
+EMBED_DISK_CACHE_PATH = os.getenv(
+    "EMBED_DISK_CACHE_PATH",
+    os.path.join(os.getenv("TRANSFORMERS_CACHE", r"D:\ML_Models_Cache\huggingface"), "query_embeddings.sqlite3")
+)
+
+
+class DiskEmbeddingCache:
+    """
+    SQLite store of query embeddings (float16 blobs, ~2 KB each) keyed by
+    sha256 of model name + text. Errors are logged and treated as misses so
+    the disk tier can never fail a search.
+    """
+
+    def __init__(self, path: str, namespace: str = EMBEDDING_MODEL_NAME):
+        self.namespace = namespace
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS query_embeddings (key TEXT PRIMARY KEY, vec BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.namespace}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, texts) -> dict:
+        keys = {self._key(t): t for t in texts}
+        try:
+            placeholders = ",".join("?" * len(keys))
+            found = self._conn.execute(
+                f"SELECT key, vec FROM query_embeddings WHERE key IN ({placeholders})", list(keys)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding disk cache read failed: {e}")
+            return {}
+        return {
+            keys[key]: tuple(np.frombuffer(vec, dtype=np.float16).astype(np.float32).tolist())
+            for key, vec in found
+        }
+
+    def put_many(self, items: dict) -> None:
+        try:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO query_embeddings (key, vec) VALUES (?, ?)",
+                [(self._key(t), np.asarray(v, dtype=np.float16).tobytes()) for t, v in items.items()],
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding disk cache write failed: {e}")
+
+
+class BatchedEmbedder:
+    """
+    LRU cache of query embeddings whose misses are encoded in micro-batches.
+    Misses are first looked up in the optional DiskEmbeddingCache, so popular
+    queries are not re-encoded after a restart.
+
+    Concurrent misses (parallel searches, HyDE + semantic-cache lookups) are
+    queued and a single worker thread encodes whatever arrives within
+    EMBED_BATCH_WAIT_SECONDS as one batch, so the GPU sees one batched
+    forward pass instead of many batch-size-1 calls. Identical texts that
+    are already in flight share the same Future.
+    """
+
+    def __init__(self, maxsize=EMBED_CACHE_MAXSIZE, batch_size=EMBED_BATCH_SIZE,
+                 max_wait=EMBED_BATCH_WAIT_SECONDS, disk_path=EMBED_DISK_CACHE_PATH):
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._disk_path = disk_path
+        self._disk = None
+
+    def _get_disk(self):
+        """Open the disk tier on first use (from the worker thread)."""
+        if self._disk is None and self._disk_path:
+            try:
+                self._disk = DiskEmbeddingCache(self._disk_path)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Embedding disk cache disabled ({e})")
+                self._disk_path = None
+        return self._disk
+
+    def get(self, text: str) -> tuple:
+        with self._lock:
+            if text in self._cache:
+                self._cache.move_to_end(text)
+                return self._cache[text]
+            future = self._pending.get(text)
+            if future is None:
+                future = Future()
+                self._pending[text] = future
+                self._queue.put(text)
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="query-embedder", daemon=True)
+                    self._worker.start()
+        return future.result()
+
+    def _collect_batch(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            rows, error = {}, None
+            try:
+                disk = self._get_disk()
+                if disk is not None:
+                    rows = disk.get_many(batch)
+                missing = [t for t in batch if t not in rows]
+                if missing:
+                    vectors = get_query_encoder().encode(
+                        missing,
+                        batch_size=self.batch_size,
+                        normalize_embeddings=True,
+                        convert_to_numpy=True,
+                    )
+                    fresh = {t: tuple(vec.tolist()) for t, vec in zip(missing, vectors)}
+                    rows.update(fresh)
+                    if disk is not None:
+                        disk.put_many(fresh)
+            except Exception as e:
+                error = e
+
+            with self._lock:
+                for text in batch:
+                    future = self._pending.pop(text)
+                    if error is not None:
+                        future.set_exception(error)
+                        continue
+                    self._cache[text] = rows[text]
+                    self._cache.move_to_end(text)
+                    future.set_result(rows[text])
+                while len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+            if len(batch) > 1:
+                logger.debug(f"Encoded {len(batch)} queued query embeddings in one batch")
+
+
+_embedder = BatchedEmbedder()
+
+# ~512 tokens (the encoders' max_length) for most languages; the tokenizer
+# truncates to max_length as well, this just skips tokenizing the excess.
+EMBED_MAX_CHARS = 2048
+_truncated_inputs = 0
+
+
 # OPTIMIZATION: Cache query embeddings for performance
-@lru_cache(maxsize=1000)
 def get_cached_embedding(query_text: str):
     """
     Cache query embeddings to avoid re-encoding repeated queries.
     Reduces search latency by ~40% for popular queries.
+    Misses are batched with other concurrent misses (see BatchedEmbedder).
+    Text is capped at EMBED_MAX_CHARS before tokenization (and before the cache
+    key is taken), so an outlier string cannot stall the whole batch.
+    """
+    global _truncated_inputs
+    if len(query_text) > EMBED_MAX_CHARS:
+        _truncated_inputs += 1
+        logger.info(f"✂️ Embedding input truncated from {len(query_text)} to {EMBED_MAX_CHARS} chars "
+                    f"({_truncated_inputs} truncated so far)")
+        query_text = query_text[:EMBED_MAX_CHARS]
+    return _embedder.get(query_text)
+
+# Summaries are capped server-side in the $vectorSearch projection: the
+# reranker's passage is cut to 1000 chars anyway, and only the final top-k
+# need full bodies (see fetch_bodies).
+VECTOR_SUMMARY_CHARS = 1000
+BODY_FIELDS = ("summary", "translated_summary")
+
+def _truncated(field):
+    """$project expression keeping at most VECTOR_SUMMARY_CHARS of a string field."""
+    return {"$cond": [
+        {"$eq": [{"$type": f"${field}"}, "string"]},
+        {"$substrCP": [f"${field}", 0, VECTOR_SUMMARY_CHARS]},
+        f"${field}"
+    ]}
+
+def fetch_bodies(ids):
+    """Full summary fields for the given article _ids, as {_id: {field: value}}."""
+    if not ids:
+        return {}
+    projection = {field: 1 for field in BODY_FIELDS}
+    return {
+        doc.pop("_id"): doc
+        for doc in articles.find({"_id": {"$in": list(ids)}}, projection)
+    }
+
+# Near-duplicate result cache: a query whose embedding is within the cosine
+# threshold of a recent one (same filter and limit) reuses its Atlas results.
+# Short TTL so newly ingested articles still show up.
+VECTOR_RESULT_CACHE_ENABLED = os.getenv("VECTOR_RESULT_CACHE", "1") == "1"
+_result_cache = SemanticCache(
+    threshold=float(os.getenv("VECTOR_RESULT_CACHE_THRESHOLD", "0.97")),
+    max_entries=10000,
+    ttl_seconds=float(os.getenv("VECTOR_RESULT_CACHE_TTL", "300"))
+)
+
+class CandidateSchedule:
+    """
+    Per filter-shape EMA of the fraction of $vectorSearch candidates that
+    survive the pre-filter, used to size numCandidates as limit / fraction.
+
+    Shapes not seen yet start from the old fixed multipliers (2x/3x/5x by
+    filter count). A full page (results == limit) only bounds the fraction
+    from below, so it is recorded slightly optimistically; that lets the
+    schedule relax back toward 2x limit once a filter stops being selective.
+
+    Atlas applies the filter inside the ANN search, so a short page means few
+    documents match that filter's values, not that too few candidates were
+    scanned. Short pages are therefore not recorded: a narrow query (a small
+    country) must not inflate numCandidates for every query of the same shape.
     """
-    return tuple(get_model().encode(query_text, normalize_embeddings=True).tolist())
+
+    ALPHA = 0.3
+    MIN_FRACTION = 0.05
+    MAX_CANDIDATES = 10_000  # Atlas upper bound for numCandidates
+    SATURATED_BOOST = 1.25
+
+    def __init__(self):
+        self._fractions = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _initial_fraction(filter_shape):
+        if len(filter_shape) >= 3:
+            return 1 / 5
+        if len(filter_shape) >= 2:
+            return 1 / 3
+        return 1 / 2
+
+    def num_candidates(self, filter_shape, limit):
+        with self._lock:
+            fraction = self._fractions.get(filter_shape)
+        if fraction is None:
+            fraction = self._initial_fraction(filter_shape)
+        fraction = max(fraction, self.MIN_FRACTION)
+        return min(self.MAX_CANDIDATES, max(limit * 2, math.ceil(limit / fraction)))
+
+    def observe(self, filter_shape, limit, num_candidates, returned):
+        if returned < limit:
+            return
+        observed = min(1.0, returned / num_candidates * self.SATURATED_BOOST)
+        with self._lock:
+            previous = self._fractions.get(filter_shape)
+            if previous is None:
+                previous = self._initial_fraction(filter_shape)
+            self._fractions[filter_shape] = (1 - self.ALPHA) * previous + self.ALPHA * observed
+
+
+_candidate_schedule = CandidateSchedule()
 
 def vector_search(query_text, limit=120, pre_filter=None):
     """
@@ -115,21 +561,16 @@ def vector_search(query_text, limit=120, pre_filter=None):
     query_embedding = list(get_cached_embedding(query_text))
     logger.info(f"✅ Query embedding generated (dim: {len(query_embedding)})")
 
-    # OPTIMIZATION: Adaptive numCandidates based on filter strictness
-    # More filters = need more candidates to ensure good results survive filtering
-    filter_count = len(pre_filter.keys()) if pre_filter else 0
-    
-    if filter_count >= 3:
-        # Multiple strict filters (e.g., country + category + status)
-        num_candidates = limit * 5
-    elif filter_count >= 2:
-        # Moderate filtering
-        num_candidates = limit * 3
-    else:
-        # Light or no filtering
-        num_candidates = limit * 2
-    
-    logger.info(f"📊 Adaptive numCandidates: {num_candidates} (filters: {filter_count})")
+    cache_tag = (limit, json.dumps(pre_filter, sort_keys=True, default=str))
+    if VECTOR_RESULT_CACHE_ENABLED:
+        cached = _result_cache.lookup(query_embedding, tag=cache_tag)
+        if cached is not None:
+            logger.info(f"⚡ Vector search served from semantic result cache: {len(cached)} results")
+            return cached
+
+    filter_shape = frozenset(pre_filter.keys()) if pre_filter else frozenset()
+    num_candidates = _candidate_schedule.num_candidates(filter_shape, limit)
+    logger.info(f"📊 Adaptive numCandidates: {num_candidates} (filter shape: {sorted(filter_shape)})")
 
     vector_query = {
         "index": VECTOR_INDEX_NAME,
@@ -156,8 +597,8 @@ def vector_search(query_text, limit=120, pre_filter=None):
                 "_id": 1,
                 "title": 1,
                 "translated_title": 1,
-                "summary": 1,
-                "translated_summary": 1,
+                "summary": _truncated("summary"),
+                "translated_summary": _truncated("translated_summary"),
                 "keywords": 1,
                 "category": 1,
                 "country": 1,
@@ -169,8 +610,13 @@ def vector_search(query_text, limit=120, pre_filter=None):
     ]
 
     try:
-        results = list(articles.aggregate(pipeline))
+        # One batch of `limit` docs: the default first batch (101) would need a
+        # getMore round-trip for the 200-doc broad-query limit
+        results = list(articles.aggregate(pipeline, batchSize=limit))
         logger.info(f"✅ Vector search completed: {len(results)} results found")
+        _candidate_schedule.observe(filter_shape, limit, num_candidates, len(results))
+        if VECTOR_RESULT_CACHE_ENABLED:
+            _result_cache.add(query_embedding, results, tag=cache_tag)
         logger.info("=" * 80)
         return results
     except Exception as e:
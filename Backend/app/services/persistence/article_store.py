@@ -1,78 +1,164 @@
 # Article Store - Persistence Layer
 import logging
 from datetime import datetime, timedelta
+import numpy as np
+from bson.binary import Binary, BinaryVectorDtype, VECTOR_SUBTYPE
+from pymongo.errors import BulkWriteError
 from app.database import get_db
 from app.models.article import Article
 
 
+# Fields that lead a discovery tier query (see news_fetcher.build_discovery_tiers)
+DISCOVERY_TIER_FIELDS = ("city", "state", "country", "continent", "source")
+
+# Serves BackgroundNLPWorker's claim query (see bootstrap)
+WORKER_QUEUE_INDEX = "worker_queue_idx"
+
+
+def discovery_index_name(field):
+    return f"discovery_status_{field}_created_at"
+
+
+def normalize_context(context):
+    """
+    Lowercase the location/category keys of a resolved context once per request.
+    The result is what ArticleStore.fetch_recent* expect, so those stay pure lookups.
+    """
+    normalized = dict(context)
+    for key in ("continent", "country", "category"):
+        normalized[key] = str(context.get(key, "unknown")).lower()
+    normalized["language"] = tuple(context.get("language") or ())
+    return normalized
+
+
+def embedding_vector(vector):
+    """
+    Pack an embedding (numpy array or list of floats) as a BSON float32 vector
+    (BinData subtype 9). Atlas $vectorSearch indexes it like a numeric array, at
+    4 bytes per dimension and without building a Python list on write.
+    """
+    if isinstance(vector, Binary):
+        return vector
+    if isinstance(vector, np.ndarray):
+        # Same layout Binary.from_vector writes: dtype byte, padding byte, little-endian floats
+        return Binary(
+            BinaryVectorDtype.FLOAT32.value + b"\x00" + vector.astype("<f4", copy=False).tobytes(),
+            VECTOR_SUBTYPE
+        )
+    return Binary.from_vector(list(vector), BinaryVectorDtype.FLOAT32)
+
+
 class ArticleStore:
     # def __init__(self, collection_name="articles"):
     def __init__(self, collection_name="news_dataset"):
-        self._collection = None
         self.collection_name = collection_name
 
-    @property
-    def collection(self):
-        if self._collection is None:
-            from app.database import get_db
-            db = get_db()
-            if db is None:
-                raise RuntimeError("Database not initialized. Call init_db(app) first.")
-            self._collection = db[self.collection_name]
-            
-            # Ensure unique index on URL
-            try:
-                self._collection.create_index(
-                    "original_url",
-                    unique=True,
-                    background=True
-                )
-            except Exception as e:
-                logger = logging.getLogger(__name__)
-                logger.warning(f"⚠️ Could not create unique index on original_url: {e}")
-
-            # ⚙️ Lifecycle Indices (Optimization for filtering by status/analyzed)
-            self._collection.create_index([("status", 1)], background=True)
-            self._collection.create_index([("analyzed", 1)], background=True)
-            self._collection.create_index([("status", 1), ("created_at", -1)], background=True)
-
-            # TTL index (Commented out for now to retain more articles)
-            # self._collection.create_index(
-            #     "created_at",
-            #     expireAfterSeconds=259200 # 72 hours (3 days)
-            # )
-
-            # 🔍 Global Text Search Index
+    def __getattr__(self, name):
+        # Bind the collection on first use (instances may be created before
+        # init_db). Afterwards `collection` is a plain instance attribute.
+        if name != "collection":
+            raise AttributeError(name)
+        db = get_db()
+        if db is None:
+            raise RuntimeError("Database not initialized. Call init_db(app) first.")
+        self.collection = db[self.collection_name]
+        return self.collection
+
+    def bootstrap(self, db):
+        """
+        Create indexes and views for the collection. Called once from init_db,
+        so request-path accesses never re-issue create_index.
+        """
+        collection = db[self.collection_name]
+        # Ensure unique index on URL
+        try:
+            collection.create_index(
+                "original_url",
+                unique=True,
+                background=True
+            )
+        except Exception as e:
             logger = logging.getLogger(__name__)
-            try:
-                self._collection.create_index(
-                    [
-                        ("keywords", "text"),
-                        ("translated_title", "text"),
-                        ("title", "text"),
-                        ("translated_summary", "text"),
-                        ("summary", "text")
-                    ],
-                    name="ArticleTextIndex",
-                    weights={
-                        "keywords": 15,
-                        "translated_title": 10,
-                        "title": 10,
-                        "translated_summary": 5,
-                        "summary": 5
-                    },
-                    background=True,
-                    default_language="none",
-                    language_override="none"
-                )
-                logger.info("MongoDB Text Search Index ensured.")
-            except Exception as e:
-                logger.warning(f"Text index creation skipped or failed: {e}")
-            
-            # 🚀 Automatic View Creation
-            self._ensure_views(db)
-            
-        return self._collection
+            logger.warning(f"⚠️ Could not create unique index on original_url: {e}")
+
+        # ⚙️ Lifecycle Indices (Optimization for filtering by status/analyzed)
+        self._ensure_index(collection, [("status", 1)])
+        self._ensure_index(collection, [("analyzed", 1)])
+        self._ensure_index(collection, [("status", 1), ("created_at", -1)])
+
+        # 🧵 Worker Queue Index (BackgroundNLPWorker claim query, ESR order)
+        # status is an $in over two values, created_at is the sort and
+        # retry_count the range, so documents come out already in claim order.
+        self._ensure_index(
+            collection,
+            [("status", 1), ("created_at", 1), ("retry_count", 1)],
+            name=WORKER_QUEUE_INDEX
+        )
+
+        # 🧭 Discovery Tier Indices (equality -> sort, matching build_discovery_tiers)
+        # Each tier filters on status + one location/source field and sorts on
+        # (created_at, _id), so each gets its own compound index.
+        for field in DISCOVERY_TIER_FIELDS:
+            self._ensure_index(
+                collection,
+                [("status", 1), (field, 1), ("created_at", -1), ("_id", -1)],
+                name=discovery_index_name(field)
+            )
+        self._ensure_index(collection, [("category", 1), ("created_at", -1)])
+        self._ensure_index(collection, [("inferred_category", 1), ("created_at", -1)])
+
+        # 🗂️ Context Cache Index (fetch_recent_by_context, ESR order)
+        # Equality fields first, then the $in on language, then created_at,
+        # which serves both the sort and the freshness-window range.
+        self._ensure_index(
+            collection,
+            [("continent", 1), ("country", 1), ("category", 1), ("language", 1), ("created_at", -1)],
+            name="ctx_recent_idx"
+        )
+
+        # TTL index (Commented out for now to retain more articles)
+        # collection.create_index(
+        #     "created_at",
+        #     expireAfterSeconds=259200 # 72 hours (3 days)
+        # )
+
+        # 🔍 Global Text Search Index
+        logger = logging.getLogger(__name__)
+        try:
+            collection.create_index(
+                [
+                    ("keywords", "text"),
+                    ("translated_title", "text"),
+                    ("title", "text"),
+                    ("translated_summary", "text"),
+                    ("summary", "text")
+                ],
+                name="ArticleTextIndex",
+                weights={
+                    "keywords": 15,
+                    "translated_title": 10,
+                    "title": 10,
+                    "translated_summary": 5,
+                    "summary": 5
+                },
+                background=True,
+                default_language="none",
+                language_override="none"
+            )
+            logger.info("MongoDB Text Search Index ensured.")
+        except Exception as e:
+            logger.warning(f"Text index creation skipped or failed: {e}")
+        
+        # 🚀 Automatic View Creation
+        self._ensure_views(db)
+
+    @staticmethod
+    def _ensure_index(collection, keys, **kwargs):
+        """Create one index; a failure is logged so the remaining indexes are still built."""
+        try:
+            collection.create_index(keys, background=True, **kwargs)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"⚠️ Could not create index {kwargs.get('name', keys)}: {e}")
 
     def _ensure_views(self, db):
         """Create Virtual Collections (Views) for better organization in DB viewers"""
@@ -109,18 +195,61 @@ class ArticleStore:
             # Duplicate URL
             return None
 
+    def save_many_if_new(self, articles):
+        """
+        Bulk insert articles in one round-trip, skipping URLs already present.
+        Unordered, so a duplicate does not stop the remaining inserts.
+        Returns (inserted_urls, duplicate_urls); articles in neither list failed
+        to store and may be retried.
+        """
+        if not articles:
+            return [], []
+        urls = [article.original_url for article in articles]
+        try:
+            self.collection.insert_many(
+                [article.to_dict() for article in articles],
+                ordered=False
+            )
+            return urls, []
+        except BulkWriteError as e:
+            # Duplicate URLs surface as per-document write errors (code 11000)
+            errors = e.details.get("writeErrors", [])
+            failed = {error["index"] for error in errors}
+            duplicate_urls = [urls[error["index"]] for error in errors if error.get("code") == 11000]
+            if len(duplicate_urls) < len(failed):
+                logging.getLogger(__name__).warning(
+                    f"Bulk article insert: {len(failed) - len(duplicate_urls)} articles failed to store"
+                )
+            inserted_urls = [url for index, url in enumerate(urls) if index not in failed]
+            return inserted_urls, duplicate_urls
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Bulk article insert failed: {e}")
+            return [], []
+
+    def existing_urls(self, urls):
+        """
+        Return the subset of `urls` already stored, using one indexed $in query.
+        """
+        if not urls:
+            return set()
+        cursor = self.collection.find(
+            {"original_url": {"$in": list(urls)}},
+            {"original_url": 1, "_id": 0}
+        )
+        return {doc["original_url"] for doc in cursor}
+
     def fetch_recent(self, context, limit=50):
         """
         Fetch recent articles matching context.
+        `context` must already be passed through normalize_context().
         """
-        # Normalize to lowercase for case-insensitive matching
         query = {
             "language": {"$in": context["language"]},
-            "continent": str(context["continent"]).lower()
+            "continent": context["continent"]
         }
 
         if context["country"] != "unknown":
-            query["country"] = str(context["country"]).lower()
+            query["country"] = context["country"]
 
         return list(
             self.collection
@@ -133,21 +262,21 @@ class ArticleStore:
         """
         Cache-first fetch:
         Return recent articles matching context if within freshness window.
+        `context` must already be passed through normalize_context().
         """
         since = datetime.utcnow() - timedelta(minutes=minutes)
 
-        # Normalize to lowercase for case-insensitive matching
         query = {
             "created_at": {"$gte": since},
             "language": {"$in": context["language"]},
-            "continent": str(context["continent"]).lower()
+            "continent": context["continent"]
         }
 
         if context["country"] != "unknown":
-            query["country"] = str(context["country"]).lower()
+            query["country"] = context["country"]
 
         if context["category"] != "unknown":
-            query["category"] = str(context["category"]).lower()
+            query["category"] = context["category"]
 
         return list(
             self.collection
@@ -0,0 +1,65 @@
+# Text Cache - Persistence Layer
+"""
+MongoDB-backed cache of model outputs (embeddings, translations) keyed by a
+hash of the input text, so reprinted/boilerplate text is only processed once.
+Errors are logged and treated as misses: the cache can never fail a pipeline.
+"""
+import hashlib
+import logging
+from datetime import datetime
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+
+def text_key(text, *namespace, normalize=False):
+    """
+    blake2b key of `text`, prefixed by namespace parts (model name, languages...).
+    normalize=True strips and lowercases first, so trivially different copies match.
+    """
+    if normalize:
+        text = text.strip().lower()
+    payload = "\0".join([*map(str, namespace), text]).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+class TextCache:
+    def __init__(self, db, collection_name):
+        self.collection = db[collection_name]
+        try:
+            self.collection.create_index("key", unique=True, background=True)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not create index on {collection_name}.key: {e}")
+
+    def get_many(self, keys):
+        """Return {key: value} for the keys present, in one query."""
+        if not keys:
+            return {}
+        try:
+            cursor = self.collection.find({"key": {"$in": list(keys)}}, {"key": 1, "value": 1, "_id": 0})
+            return {doc["key"]: doc["value"] for doc in cursor}
+        except Exception as e:
+            logger.warning(f"Text cache read failed: {e}")
+            return {}
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items):
+        """Store {key: value}; keys already present (e.g. a concurrent writer) are skipped."""
+        if not items:
+            return
+        now = datetime.utcnow()
+        try:
+            self.collection.insert_many(
+                [{"key": key, "value": value, "created_at": now} for key, value in items.items()],
+                ordered=False
+            )
+        except BulkWriteError:
+            # Duplicate keys only
+            pass
+        except Exception as e:
+            logger.warning(f"Text cache write failed: {e}")
+
+    def put(self, key, value):
+        self.put_many({key: value})
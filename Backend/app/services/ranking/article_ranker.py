@@ -1,5 +1,7 @@
 from datetime import datetime, timezone
 
+import numpy as np
+
 
 class ArticleRanker:
     """
@@ -54,3 +56,53 @@ class ArticleRanker:
                 score += max(0, 20 - int(hours_old))
 
         return score
+
+    def score_batch(self, articles: list, context: dict, tier_level: str) -> np.ndarray:
+        """
+        Vectorized equivalent of score() for a whole tier batch.
+        Context lookups are hoisted out of the per-article work and the
+        components are summed over structure-of-arrays views of the batch.
+        """
+        n = len(articles)
+        if n == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        scores = np.full(n, self.TIER_WEIGHTS.get(tier_level, 0), dtype=np.int64)
+
+        # ---------------- Location match ----------------
+        ctx_city = context.get("city")
+        ctx_state = context.get("state")
+        ctx_country = context.get("country")
+        city_hit = np.fromiter((bool(ctx_city) and a.get("city") == ctx_city for a in articles), dtype=bool, count=n)
+        state_hit = np.fromiter((bool(ctx_state) and a.get("state") == ctx_state for a in articles), dtype=bool, count=n)
+        country_hit = np.fromiter((bool(ctx_country) and a.get("country") == ctx_country for a in articles), dtype=bool, count=n)
+        scores += np.select([city_hit, state_hit, country_hit], [30, 20, 10], default=0)
+
+        # ---------------- Language match ----------------
+        ctx_language = context.get("language", [])
+        lang_hit = np.fromiter((a.get("language") in ctx_language for a in articles), dtype=bool, count=n)
+        scores += np.where(lang_hit, 15, 5)
+
+        # ---------------- Category match ----------------
+        ctx_category = context.get("category")
+        if ctx_category != "unknown":
+            cat_hit = np.fromiter((a.get("category") == ctx_category for a in articles), dtype=bool, count=n)
+            scores += np.where(cat_hit, 15, 0)
+
+        # ---------------- Recency boost ----------------
+        def _ts(article):
+            published_at = article.get("published_date") or article.get("created_at")
+            if isinstance(published_at, datetime):
+                if published_at.tzinfo is None:
+                    # Assume naive datetimes from DB are UTC
+                    published_at = published_at.replace(tzinfo=timezone.utc)
+                return published_at.timestamp()
+            return np.nan
+
+        published_ts = np.fromiter((_ts(a) for a in articles), dtype=np.float64, count=n)
+        has_date = ~np.isnan(published_ts)
+        if has_date.any():
+            hours_old = np.trunc((datetime.now(timezone.utc).timestamp() - published_ts[has_date]) / 3600)
+            scores[has_date] += np.maximum(0, 20 - hours_old).astype(np.int64)
+
+        return scores
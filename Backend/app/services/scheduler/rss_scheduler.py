@@ -1,5 +1,8 @@
+import sys
 import time
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from app.services.discovery.fetch.rss_fetcher import fetch_rss_articles
 from app.services.discovery.fetch.source_selector import select_sources
 from app.services.persistence.article_store import ArticleStore
@@ -8,6 +11,53 @@ from app.services.persistence.article_store import ArticleStore
 logger = logging.getLogger(__name__)
 
 MAX_ARTICLES_PER_SOURCE = 50
+INSERT_BATCH_SIZE = 25
+SEEN_URL_CACHE_SIZE = 20000
+
+# Shared placeholder values stamped on every new article
+_GLOBAL = sys.intern("global")
+_UNKNOWN = sys.intern("unknown")
+MAX_PROCESSING_WAIT_SECONDS = 600  # ~10 minutes max wait for the worker
+
+# og:image lookups are plain HTTP fetches, so a window of items is resolved
+# concurrently; classification stays sequential (shared transformer pipeline).
+IMAGE_FETCH_WORKERS = 16
+_image_pool = ThreadPoolExecutor(max_workers=IMAGE_FETCH_WORKERS, thread_name_prefix="rss-image")
+
+
+# Feeds are downloaded a few sources ahead so the next source's XML is ready
+# when the coordinator releases the fetcher; sources are still stored and
+# handed to the worker one at a time.
+FEED_PREFETCH = 4
+_feed_pool = ThreadPoolExecutor(max_workers=FEED_PREFETCH, thread_name_prefix="rss-feed")
+
+
+def _prefetched_feeds(sources):
+    """Yield (source, future of fetch_rss_articles) keeping FEED_PREFETCH in flight."""
+    in_flight = deque()
+    for source in sources:
+        in_flight.append((source, _feed_pool.submit(fetch_rss_articles, source["feed_url"], source["name"])))
+        if len(in_flight) >= FEED_PREFETCH:
+            yield in_flight.popleft()
+    while in_flight:
+        yield in_flight.popleft()
+
+
+def _resolve_image(item):
+    # 🔹 Lazy import to speed up scheduler startup
+    from app.services.discovery.fetch.image_enricher import fetch_image_url
+    return item.get("image_url") or fetch_image_url(item["original_url"])
+
+
+def _with_images(items):
+    """
+    Yield (item, image_url) in feed order. Images are fetched one window of
+    IMAGE_FETCH_WORKERS items at a time, so stopping early (quota reached,
+    scheduler paused) wastes at most one window of requests.
+    """
+    for start in range(0, len(items), IMAGE_FETCH_WORKERS):
+        window = items[start:start + IMAGE_FETCH_WORKERS]
+        yield from zip(window, _image_pool.map(_resolve_image, window))
 
 
 class RSSScheduler:
@@ -15,6 +65,31 @@ class RSSScheduler:
         self.interval = interval_minutes * 60
         self.article_store = ArticleStore()
         self._paused = False
+        # Bounded memory of URLs known to be stored; oldest entries fall off first
+        self._seen_urls = deque(maxlen=SEEN_URL_CACHE_SIZE)
+        self._seen_set = set()
+
+    def _remember_url(self, url):
+        if url in self._seen_set:
+            return
+        if len(self._seen_urls) == self._seen_urls.maxlen:
+            self._seen_set.discard(self._seen_urls[0])
+        self._seen_urls.append(url)
+        self._seen_set.add(url)
+
+    def _drop_known(self, items):
+        """
+        Filter out items whose URL is already stored, before any image fetch or
+        classification is spent on them. Returns (new_items, duplicate_count).
+        """
+        unseen = [item for item in items if item["original_url"] not in self._seen_set]
+        stored_urls = self.article_store.existing_urls(
+            {item["original_url"] for item in unseen}
+        )
+        for url in stored_urls:
+            self._remember_url(url)
+        new_items = [item for item in unseen if item["original_url"] not in stored_urls]
+        return new_items, len(items) - len(new_items)
 
     def pause(self):
         """Pauses the scheduler's fetching logic."""
@@ -45,7 +120,7 @@ class RSSScheduler:
         
         coordinator = get_coordinator()
 
-        for source in RSS_SOURCES:
+        for source, feed in _prefetched_feeds(RSS_SOURCES):
             if self._paused:
                 break
 
@@ -61,7 +136,7 @@ class RSSScheduler:
                 # Notify coordinator we're fetching from this source
                 coordinator.start_fetching_source(source["name"])
                 
-                rss_items = fetch_rss_articles(source["feed_url"], source["name"])
+                rss_items = feed.result()
                 if not rss_items:
                     logger.info(f"   Empty feed for {source['name']}")
                     coordinator.finish_fetching_source(source["name"], 0)
@@ -69,24 +144,41 @@ class RSSScheduler:
 
                 logger.info(f"   Feed analysis: {len(rss_items)} items found")
                 stored = 0
-                duplicates = 0
+                rss_items, duplicates = self._drop_known(rss_items)
                 no_image = 0
+                pending = []
+
+                def flush():
+                    nonlocal stored, duplicates
+                    inserted_urls, duplicate_urls = self.article_store.save_many_if_new(pending)
+                    stored += len(inserted_urls)
+                    duplicates += len(duplicate_urls)
+                    # Failed inserts are not remembered, so the next cycle retries them
+                    for url in inserted_urls + duplicate_urls:
+                        self._remember_url(url)
+                    pending.clear()
                 
-                for item in rss_items:
+                # 🔹 Lazy imports to speed up scheduler startup
+                from app.services.analysis.classification.category_classifier import classify_category
+                from app.models.article import Article
+
+                # Per-source Article fields, built once instead of per item
+                source_fields = {
+                    "source": sys.intern(source["name"]),
+                    "language": sys.intern(source["language"][0]), # 🌐 Keep using RSS for language as requested
+                    "country": _GLOBAL, # 🛠️ Dynamic: Start global, let NLP localize later
+                    "continent": _GLOBAL, # 🛠️ Dynamic: Start global, let NLP localize later
+                    "category": _UNKNOWN, # 🛠️ Dynamic: Start unknown, let NLP classify later
+                }
+
+                # 🔹 Image Enrichment (one fast HTTP call per item, fetched concurrently)
+                for item, image_url in _with_images(rss_items):
                     if self._paused:
                         break
                     
                     if stored >= MAX_ARTICLES_PER_SOURCE:
                         break
 
-                    # 🔹 Lazy imports to speed up scheduler startup
-                    from app.services.discovery.fetch.image_enricher import fetch_image_url
-                    from app.services.analysis.classification.category_classifier import classify_category
-                    from app.models.article import Article
-
-                    # 🔹 Image Enrichment (One fast HTTP call)
-                    image_url = item.get("image_url") or fetch_image_url(item["original_url"])
-
                     if not image_url:
                         no_image += 1
                         continue  # ❌ Skip image-less news
@@ -98,23 +190,22 @@ class RSSScheduler:
                     article = Article(
                         title=item.get("title"),
                         original_url=item.get("original_url"),
-                        source=source["name"],
                         published_date=item.get("published_date"),
                         summary=item.get("summary"),
-                        language=source["language"][0], # 🌐 Keep using RSS for language as requested
-                        country="global", # 🛠️ Dynamic: Start global, let NLP localize later
-                        continent="global", # 🛠️ Dynamic: Start global, let NLP localize later
-                        category="unknown", # 🛠️ Dynamic: Start unknown, let NLP classify later
                         image_url=image_url,
                         inferred_category=category_result.get("primary", "unknown"),
                         category_confidence=category_result.get("confidence", 0.0),
                         inferred_categories=category_result.get("labels", []),
+                        **source_fields,
                     )
 
-                    if self.article_store.save_if_new(article):
-                        stored += 1
-                    else:
-                        duplicates += 1
+                    # Buffered bulk insert; a batch never exceeds the remaining quota
+                    pending.append(article)
+                    if len(pending) >= min(INSERT_BATCH_SIZE, MAX_ARTICLES_PER_SOURCE - stored):
+                        flush()
+
+                if pending:
+                    flush()
                 
                 if duplicates > 0 or no_image > 0:
                     logger.info(f"   Skipped: {duplicates} duplicates, {no_image} without images")
@@ -134,18 +225,11 @@ class RSSScheduler:
                     logger.info(f"⏸️  Pausing fetch - {stored} from this source, {total_pending} total pending")
                     logger.info("=====================================================================")
                     
-                    # Poll until all pending articles are processed
-                    max_wait_cycles = 120  # ~10 minutes max wait
-                    wait_cycle = 0
-                    
-                    while coordinator.get_status()["state"] == coordinator.PROCESSING:
-                        if wait_cycle >= max_wait_cycles:
-                            logger.info("=====================================================================")
-                            logger.warning("⚠️  Max wait time reached - resuming fetch")
-                            logger.info("=====================================================================")
-                            break
-                        time.sleep(5)
-                        wait_cycle += 1
+                    # Block until the coordinator leaves PROCESSING
+                    if not coordinator.idle_event.wait(timeout=MAX_PROCESSING_WAIT_SECONDS):
+                        logger.info("=====================================================================")
+                        logger.warning("⚠️  Max wait time reached - resuming fetch")
+                        logger.info("=====================================================================")
                     
                     logger.info("=====================================================================")
                     logger.info(f"▶️  Worker finished - resuming fetch")
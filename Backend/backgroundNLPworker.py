@@ -9,13 +9,16 @@ Executes ONLY:
 - Event Classification (Zero-shot)
 """
 
-import time
+import os
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
 from app import create_app
-from app.services.core.pipeline_orchestrator import process_document_pipeline
-from app.services.discovery.fetch.extraction import extract_article_package
+from app.services.persistence.article_store import embedding_vector
+from app.services.persistence.text_cache import TextCache, text_key
 
 # Configure logging
 logging.basicConfig(
@@ -26,9 +29,55 @@ logger = logging.getLogger(__name__)
 
 # Worker configuration
 BATCH_SIZE = 5  # Process 2-3 articles per iteration
-SLEEP_INTERVAL = 30  # Sleep 30 seconds between batches
+SLEEP_INTERVAL = 30  # Base sleep between batches (see _next_sleep)
+MAX_IDLE_SLEEP = 300  # Idle back-off cap
 MAX_RETRIES = 3
 
+# Fields the worker reads from a claimed article; embeddings and analysis
+# output of earlier attempts are left on the server
+CLAIM_PROJECTION = {
+    "raw_text": 1, "original_url": 1, "retry_count": 1,
+    "title": 1, "translated_title": 1, "translated_summary": 1,
+}
+
+# Articles of a batch run on their own threads, so deep scrapes (plain HTTP)
+# overlap each other and the pipeline. The pipeline shares GPU models, so only
+# NLP_PIPELINE_CONCURRENCY articles run it at a time (raise it for CPU-only or
+# multi-GPU setups).
+NLP_PIPELINE_CONCURRENCY = int(os.getenv("NLP_PIPELINE_CONCURRENCY", "1"))
+_article_pool = ThreadPoolExecutor(max_workers=BATCH_SIZE, thread_name_prefix="nlp-article")
+_pipeline_slots = threading.Semaphore(NLP_PIPELINE_CONCURRENCY)
+
+
+def _article_text(article):
+    """
+    Article text for the pipeline, deep-scraping when the stored text is short.
+    Returns (raw_text, scraped) where scraped says the text is new.
+    Raises ValueError when no usable text (100+ chars) is available.
+    """
+    raw_text = article.get("raw_text") or ""
+    text_len = len(raw_text)
+    if text_len >= 200:
+        return raw_text, False
+    
+    # Only scrape if:
+    # 1. Content is missing or too short (checked above)
+    # 2. URL is a valid web URL (not internal archive like "BBC_Hindi_Archive_...")
+    original_url = article.get("original_url") or ""
+    if original_url.startswith("http"):
+        from app.services.discovery.fetch.extraction import extract_article_package
+        
+        extraction, _ = extract_article_package(original_url)
+        content = extraction.get("content") if extraction.get("success") else None
+        if content:
+            if len(content) < 100:
+                raise ValueError("Article content too short or empty")
+            return content, True
+    
+    if text_len < 100:
+        raise ValueError("Article content too short or empty")
+    return raw_text, False
+
 
 class BackgroundNLPWorker:
     """
@@ -40,6 +89,8 @@ class BackgroundNLPWorker:
         self.app = app
         self.db = app.db
         self.running = False
+        # Reprints and shared wire copy re-use stored vectors instead of re-encoding
+        self.embedding_cache = TextCache(self.db, "embedding_cache") if self.db is not None else None
         
     def stop(self):
         """Stop the worker gracefully"""
@@ -61,18 +112,35 @@ class BackgroundNLPWorker:
         if not coordinator.can_process():
             return 0
         
-        # Find pending articles that haven't exceeded retry limit
-        # pending_articles = list(self.db.articles.find({
-        pending_articles = list(self.db.news_dataset.find({
-            "status": {"$in": ["pending", "failed"]},
-            "retry_count": {"$lt": MAX_RETRIES}
-        }).sort("created_at", 1).limit(BATCH_SIZE))
+        # Bound once per batch; used on every claim and status update below
+        # collection = self.db.articles
+        collection = self.db.news_dataset
+        utcnow = datetime.utcnow
+        
+        # Atomically find + claim pending articles that haven't exceeded retry limit,
+        # oldest first; concurrent workers can never claim the same article
+        pending_articles = []
+        claimed_at = utcnow()
+        for _ in range(BATCH_SIZE):
+            article = collection.find_one_and_update(
+                {"status": {"$in": ["pending", "failed"]}, "retry_count": {"$lt": MAX_RETRIES}},
+                {"$set": {"status": "processing", "updated_at": claimed_at}},
+                sort=[("created_at", 1)],
+                projection=CLAIM_PROJECTION,
+                return_document=ReturnDocument.AFTER
+            )
+            if article is None:
+                break
+            pending_articles.append(article)
         
         if not pending_articles:
             # No more pending - transition to IDLE
             coordinator.set_state(coordinator.IDLE)
             return 0
         
+        # 🔹 Lazy import: the NLP stack is only loaded once there is work to do
+        from app.services.core.pipeline_orchestrator import process_document_pipeline
+        
         # Update coordinator with current pending count
         coordinator.update_pending_count(len(pending_articles))
         
@@ -80,47 +148,79 @@ class BackgroundNLPWorker:
         logger.info(f"Processing {len(pending_articles)} articles")
         logger.info("===============================================")
         processed_count = 0
+        completed = []  # (article _id, text to embed) for articles whose pipeline succeeded
+        scraped = {}  # article _id -> freshly scraped raw_text
+        ops = []  # terminal status updates, written in one bulk_write
+        
+        outcomes = _article_pool.map(
+            lambda article: self._process_single_article(article, process_document_pipeline, utcnow),
+            pending_articles
+        )
+        for article, (embed_text, scraped_text, failure_update) in zip(pending_articles, outcomes):
+            if scraped_text is not None:
+                # Saved with the article's terminal update
+                scraped[article["_id"]] = scraped_text
+            if failure_update is not None:
+                if scraped_text is not None:
+                    # Keep the scrape so a retry does not repeat it
+                    failure_update["$set"]["raw_text"] = scraped_text
+                ops.append(UpdateOne({"_id": article["_id"]}, failure_update))
+            else:
+                completed.append((article["_id"], embed_text))
+        
+        embeddings = self._encode_embeddings(completed) if completed else {}
+        
+        # One timestamp for the whole batch's terminal updates
+        finished_at = utcnow()
+        for article_id, _ in completed:
+            # Mark as partial (searchable but not fully analyzed); raw_text and
+            # embedding ride along in the same update
+            fields = {
+                "status": "partial",
+                "processed_at": finished_at,
+                "retry_count": 0  # Reset on success
+            }
+            if article_id in scraped:
+                fields["raw_text"] = scraped[article_id]
+            if article_id in embeddings:
+                fields["embedding"] = embeddings[article_id]
+            ops.append(UpdateOne({"_id": article_id}, {"$set": fields}))
+        
+        if ops:
+            collection.bulk_write(ops, ordered=False)
         
-        for article in pending_articles:
-            article_id = str(article["_id"])
+        for article_id, _ in completed:
+            logger.info("===============================================")
+            logger.info(f"✅ [{article_id}] Partial processing complete")
+            logger.info("===============================================")
+            processed_count += 1
             
-            try:
-                # Atomically claim this article
-                # result = self.db.articles.update_one(
-                result = self.db.news_dataset.update_one(
-                    {"_id": article["_id"], "status": {"$ne": "processing"}},
-                    {"$set": {"status": "processing", "updated_at": datetime.utcnow()}}
-                )
-                
-                if result.modified_count == 0:
-                    # Another worker claimed it
-                    continue
-                
-                logger.info(f"📰 [{article_id}] Processing...")
-                
-                # Get article text (deep scrape if RSS summary is too short)
-                raw_text = article.get("raw_text", "")
-                original_url = article.get("original_url", "")
-                
-                # Only scrape if:
-                # 1. Content is missing or too short
-                # 2. URL is a valid web URL (not internal archive like "BBC_Hindi_Archive_...")
-                if len(raw_text) < 200 and original_url.startswith("http"):
-                    extraction, _ = extract_article_package(original_url)
-                    if extraction.get("success") and extraction.get("content"):
-                        raw_text = extraction["content"]
-                        # Update raw_text in database
-                        # self.db.articles.update_one(
-                        self.db.news_dataset.update_one(
-                            {"_id": article["_id"]},
-                            {"$set": {"raw_text": raw_text}}
-                        )
-                        
-                
-                if not raw_text or len(raw_text) < 100:
-                    raise ValueError("Article content too short or empty")
-                
-                # Run PARTIAL pipeline - keywords, entities, event only
+            # Notify coordinator
+            coordinator.mark_article_processed()
+        
+        return processed_count
+    
+    def _process_single_article(self, article, process_document_pipeline, utcnow):
+        """
+        Scrape (if needed) and run the partial pipeline for one claimed article.
+        Returns (embed_text, scraped_text, failure_update): embed_text is set on
+        success, failure_update (retry / hard_failed update document) on failure,
+        scraped_text whenever a fresh scrape was made.
+        """
+        article_id = str(article["_id"])
+        scraped_text = None
+        
+        try:
+            logger.info(f"📰 [{article_id}] Processing...")
+            
+            # Get article text (deep scrape if RSS summary is too short)
+            raw_text, was_scraped = _article_text(article)
+            if was_scraped:
+                scraped_text = raw_text
+            
+            # Run PARTIAL pipeline - keywords, entities, event only
+            # (pool threads don't inherit run()'s app context, so push one here)
+            with _pipeline_slots, self.app.app_context():
                 result = process_document_pipeline(
                     db=self.db,
                     doc_id=article_id,
@@ -129,87 +229,99 @@ class BackgroundNLPWorker:
                     # collection="articles"
                     collection="news_dataset"
                 )
-                
-                if not result.get("success"):
-                    raise Exception(result.get("error", "Pipeline failed"))
-                
-                # Generate embedding for vector search (REFACTORED to use Centralized Model)
-                try:
-                    from app.services.intelli_search.vector_retriever import get_model
-                    
-                    # Use the shared singleton model (Supports FP16 automatically)
-                    embedding_model = get_model()
-                    
-                    # Get article text for embedding
-                    # article_doc = self.db.articles.find_one({"_id": article["_id"]})
-                    article_doc = self.db.news_dataset.find_one({"_id": article["_id"]})
-                    title = article_doc.get("translated_title") or article_doc.get("title", "")
-                    summary = article_doc.get("translated_summary") or article_doc.get("summary", "")
-                    text_to_embed = f"{title} {summary}".strip()
-                    
-                    if text_to_embed:
-                        # Generate embedding
-                        embedding = embedding_model.encode(text_to_embed, normalize_embeddings=True)
-                        
-                        # Store embedding in MongoDB
-                        # self.db.articles.update_one(
-                        self.db.news_dataset.update_one(
-                            {"_id": article["_id"]},
-                            {"$set": {"embedding": embedding.tolist()}}
-                        )
-                        logger.info(f"✅ [{article_id}] Embedding generated (vector search enabled)")
-                    
-                except Exception as embed_error:
-                    # Don't fail the entire process if embedding fails
-                    logger.warning(f"[{article_id}] Embedding generation failed: {str(embed_error)}")
-                
-                # Mark as partial (searchable but not fully analyzed)
-                self.db.news_dataset.update_one(
-                    {"_id": article["_id"]},
-                    {"$set": {
-                        "status": "partial",
-                        "processed_at": datetime.utcnow(),
-                        "retry_count": 0  # Reset on success
-                    }}
-                )
-                
-                logger.info("===============================================")
-                logger.info(f"✅ [{article_id}] Partial processing complete")
-                logger.info("===============================================")
-                processed_count += 1
-                
-                # Notify coordinator
-                coordinator.mark_article_processed()
-                
-            except Exception as e:
-                logger.info("===============================================")
-                logger.error(f"[{article_id}] ✗ Processing failed: {str(e)}")
-                logger.info("===============================================")
-                
-                # Increment retry counter
-                retry_count = article.get("retry_count", 0) + 1
-                
-                if retry_count >= MAX_RETRIES:
-                    logger.error(f"[{article_id}] Max retries exceeded or hard failure, marking as HARD_FAILED")
-                    self.db.news_dataset.update_one(
-                        {"_id": article["_id"]},
-                        {"$set": {"status": "hard_failed", "last_error": str(e), "updated_at": datetime.utcnow()}}
-                    )
-                else:
-                    logger.warning(f"[{article_id}] Processing failed, will retry ({retry_count}/{MAX_RETRIES})")
-                    self.db.news_dataset.update_one(
-                        {"_id": article["_id"]},
-                        {
-                            "$set": {
-                                "status": "pending",
-                                "last_error": str(e),
-                                "updated_at": datetime.utcnow()
-                            },
-                            "$inc": {"retry_count": 1}
-                        }
-                    )
+            
+            if not result.get("success"):
+                raise Exception(result.get("error", "Pipeline failed"))
+            
+            # Embedding text is collected here and encoded for the whole batch.
+            # The pipeline only rewrites `summary` (returned as stored_summary);
+            # titles and translated fields are as claimed, so no re-read is needed.
+            stored_summary = result.get("stored_summary")
+            if isinstance(stored_summary, dict):
+                stored_summary = stored_summary.get("en")
+            parts = (
+                article.get("translated_title") or article.get("title"),
+                article.get("translated_summary") or stored_summary,
+            )
+            # Empty text is skipped by _encode_embeddings (no embedding field written)
+            return " ".join(p.strip() for p in parts if p), scraped_text, None
+            
+        except Exception as e:
+            logger.info("===============================================")
+            logger.error(f"[{article_id}] ✗ Processing failed: {str(e)}")
+            logger.info("===============================================")
+            
+            # Increment retry counter
+            retry_count = article.get("retry_count", 0) + 1
+            failed_at = utcnow()
+            
+            if retry_count >= MAX_RETRIES:
+                logger.error(f"[{article_id}] Max retries exceeded or hard failure, marking as HARD_FAILED")
+                update = {"$set": {"status": "hard_failed", "last_error": str(e), "updated_at": failed_at}}
+            else:
+                logger.warning(f"[{article_id}] Processing failed, will retry ({retry_count}/{MAX_RETRIES})")
+                update = {
+                    "$set": {
+                        "status": "pending",
+                        "last_error": str(e),
+                        "updated_at": failed_at
+                    },
+                    "$inc": {"retry_count": 1}
+                }
+            return None, scraped_text, update
+    
+    def _encode_embeddings(self, completed):
+        """
+        Encode the batch's embedding texts in one model call (longest first, so
+        padded sub-batches hold similar lengths). Texts already in the embedding
+        cache (same normalized text) are not encoded again. Returns
+        {article _id: vector}. Failures are logged only: the articles are still
+        usable for keyword search.
+        """
+        to_embed = sorted(
+            ((article_id, text) for article_id, text in completed if text),
+            key=lambda pair: len(pair[1]),
+            reverse=True
+        )
+        if not to_embed:
+            return {}
         
-        return processed_count
+        try:
+            from app.services.intelli_search.vector_retriever import get_model, EMBEDDING_MODEL_NAME
+            
+            keys = {article_id: text_key(text, EMBEDDING_MODEL_NAME, normalize=True) for article_id, text in to_embed}
+            vectors = self.embedding_cache.get_many(set(keys.values())) if self.embedding_cache else {}
+            
+            misses = {}  # cache key -> text, deduplicated within the batch
+            for article_id, text in to_embed:
+                if keys[article_id] not in vectors:
+                    misses.setdefault(keys[article_id], text)
+            
+            if misses:
+                # Use the shared singleton model (Supports FP16 automatically)
+                embedding_model = get_model()
+                # Encoded on the model's device (CUDA when available) and kept as one
+                # tensor; copied back to host memory in a single transfer and stored
+                # as packed float32 bytes (no per-element Python floats)
+                embeddings = embedding_model.encode(
+                    list(misses.values()),
+                    batch_size=len(misses),
+                    normalize_embeddings=True,
+                    convert_to_tensor=True
+                ).float().cpu().numpy()
+                fresh = {key: embedding_vector(embedding) for key, embedding in zip(misses, embeddings)}
+                vectors.update(fresh)
+                if self.embedding_cache:
+                    self.embedding_cache.put_many(fresh)
+            
+            logger.info(f"✅ Embeddings ready for {len(to_embed)} articles, {len(misses)} encoded (vector search enabled)")
+            # Older cache entries hold plain lists; embedding_vector packs those too
+            return {article_id: embedding_vector(vectors[key]) for article_id, key in keys.items()}
+        
+        except Exception as embed_error:
+            # Don't fail the entire batch if embedding fails
+            logger.warning(f"Embedding generation failed for batch: {str(embed_error)}")
+            return {}
     
     def run(self):
         """
@@ -220,9 +332,14 @@ class BackgroundNLPWorker:
         logger.info(f"Configuration: batch_size={BATCH_SIZE}, sleep={SLEEP_INTERVAL}s")
         logger.info("=================================")
         
+        from app.coordinator import get_coordinator
+        
+        coordinator = get_coordinator()
         self.running = True
+        idle_sleep = SLEEP_INTERVAL
         
         while self.running:
+            processed = 0
             try:
                 with self.app.app_context():
                     processed = self.process_batch()
@@ -230,8 +347,23 @@ class BackgroundNLPWorker:
             except Exception as e:
                 logger.exception(f"Worker error: {e}")
             
-            # Sleep before next batch
-            time.sleep(SLEEP_INTERVAL)
+            # Full batch: re-poll now. Partial batch: half interval. Nothing to
+            # do: back off exponentially up to MAX_IDLE_SLEEP.
+            if processed >= BATCH_SIZE:
+                delay = 0
+                idle_sleep = SLEEP_INTERVAL
+            elif processed > 0:
+                delay = SLEEP_INTERVAL // 2
+                idle_sleep = SLEEP_INTERVAL
+            else:
+                delay = idle_sleep
+                idle_sleep = min(idle_sleep * 2, MAX_IDLE_SLEEP)
+            
+            # The coordinator's work_event cuts the sleep short as soon as the
+            # fetcher hands over new articles
+            if delay and coordinator.work_event.wait(timeout=delay):
+                idle_sleep = SLEEP_INTERVAL
+            coordinator.work_event.clear()
         
         logger.info("=================================")
         logger.info("✅ Background worker stopped")
@@ -1,3 +1,4 @@
+import gc
 import os
 import sys
 import time
@@ -146,52 +147,80 @@ if __name__ == "__main__":
             import torch
             import time
             time.sleep(1) # Reduced from 5s
+
+            # Steps run serially; each one's load-time temporaries are freed before
+            # the next model loads, so peak RSS/VRAM is one model's spike, not all
+            def release_memory():
+                gc.collect()
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+            
+            # Step 0: Embedding (Multilingual E5). Every search needs it, so it
+            # goes first instead of waiting behind the analysis models.
+            try:
+                from app.services.intelli_search.vector_retriever import warmup as embed_warmup
+                embed_warmup()
+                logger.info("✅ [Background] Embedding Model Warmup Complete")
+            except Exception as e: logger.error(f"Embedding Warmup Failed: {e}")
+            release_memory()
             
             # Step 1: Preprocessing (LID)
             try:
                 from app.services.core.preprocessing import preprocessing_service
                 preprocessing_service.warmup()
             except Exception as e: logger.error(f"LID Warmup Failed: {e}")
+            release_memory()
             
             # Step 2: NER (GLiNER)
             try:
                 from app.services.analysis.ner_service import ner_service
                 ner_service.warmup()
             except Exception as e: logger.error(f"NER Warmup Failed: {e}")
+            release_memory()
             
             # Step 3: Translation (NLLB)
             try:
                 from app.services.analysis.translation_service import translation_service
                 translation_service.warmup()
             except Exception as e: logger.error(f"Translation Warmup Failed: {e}")
+            release_memory()
             
             # Step 4: Summarization (BART)
             try:
                 from app.services.analysis.summarization import summarization_service
                 summarization_service.warmup()
             except Exception as e: logger.error(f"Summarization Warmup Failed: {e}")
+            release_memory()
             
             # Step 5: Category Classification (BART-Large)
             try:
                 from app.services.analysis.classification.category_classifier import warmup as cat_warmup
                 cat_warmup()
             except Exception as e: logger.error(f"Category Warmup Failed: {e}")
+            release_memory()
             
             # Step 6: Sentiment (RoBERTa)
             try:
                 from app.services.analysis.sentiment_service import get_sentiment_service
                 get_sentiment_service().warmup()
             except Exception as e: logger.error(f"Sentiment Warmup Failed: {e}")
+            release_memory()
             
-            # Step 7: Embedding (Multilingual E5)
+            # Step 7: Search rerankers (FlashRank + BGE cross-encoder)
             try:
-                from app.services.intelli_search.vector_retriever import get_model
-                get_model() # Forces load
-                logger.info("✅ [Background] Embedding Model Warmup Complete")
-            except Exception as e: logger.error(f"Embedding Warmup Failed: {e}")
+                from app.services.intelli_search.reranker import warmup as rerank_warmup
+                rerank_warmup()
+                logger.info("✅ [Background] Reranker Warmup Complete")
+            except Exception as e: logger.error(f"Reranker Warmup Failed: {e}")
+            release_memory()
+
+            # Step 8: Query-understanding LLM (Ollama)
+            try:
+                from app.services.intelli_search.query_processor import warmup as llm_warmup
+                llm_warmup() # Starts the Ollama load/prefix warmup
+            except Exception as e: logger.error(f"Ollama Warmup Failed: {e}")
 
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
+            release_memory()
 
             logger.info("DONE: ALL AI MODELS WARMED UP AND READY FOR INSTANT INFERENCE")
         except Exception as e:
@@ -0,0 +1,59 @@
+import numpy as np
+from bson.binary import Binary, BinaryVectorDtype, VECTOR_SUBTYPE
+
+from app.services.persistence.article_store import embedding_vector
+
+
+def test_embedding_vector_round_trips_numpy():
+    packed = embedding_vector(np.ones(4, np.float32))
+    assert packed.subtype == VECTOR_SUBTYPE
+    vector = packed.as_vector()
+    assert vector.dtype == BinaryVectorDtype.FLOAT32
+    assert vector.data == [1.0, 1.0, 1.0, 1.0]
+
+
+def test_embedding_vector_matches_from_vector():
+    values = [0.25, -0.5, 1.0]
+    expected = Binary.from_vector(values, BinaryVectorDtype.FLOAT32)
+    assert embedding_vector(np.array(values, dtype=np.float64)) == expected
+    assert embedding_vector(values) == expected
+    assert embedding_vector(expected) is expected
+
+
+class _FailingCollection:
+    def __init__(self, error):
+        self.error = error
+
+    def insert_many(self, documents, ordered=True):
+        raise self.error
+
+
+def _articles(*urls):
+    from app.models.article import Article
+    return [Article(title=url, original_url=url, source="test") for url in urls]
+
+
+def test_save_many_if_new_separates_duplicates_from_failures():
+    from pymongo.errors import BulkWriteError
+    from app.services.persistence.article_store import ArticleStore
+
+    store = ArticleStore()
+    store.collection = _FailingCollection(BulkWriteError({
+        "nInserted": 1,
+        "writeErrors": [
+            {"index": 0, "code": 11000, "errmsg": "duplicate key"},
+            {"index": 2, "code": 121, "errmsg": "document failed validation"},
+        ],
+    }))
+    inserted, duplicates = store.save_many_if_new(_articles("a", "b", "c"))
+    assert inserted == ["b"]
+    assert duplicates == ["a"]
+
+
+def test_save_many_if_new_reports_nothing_on_transient_error():
+    from pymongo.errors import AutoReconnect
+    from app.services.persistence.article_store import ArticleStore
+
+    store = ArticleStore()
+    store.collection = _FailingCollection(AutoReconnect("connection reset"))
+    assert store.save_many_if_new(_articles("a", "b")) == ([], [])
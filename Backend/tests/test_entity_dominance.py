@@ -0,0 +1,31 @@
+import pytest
+
+from app.services.intelli_search import entity_dominance
+
+
+TEXT = "New York City officials met in New York; york city traffic, aaaa"
+
+CASES = [
+    ["new york", "york city"],  # partial overlap
+    ["new york", "york"],       # containment
+    ["aa"],                     # self-overlap
+    ["city", "officials"],      # disjoint
+]
+
+
+def _expected(entities, text):
+    text_l = text.lower()
+    total = len(text_l.split())
+    return sum(min(text_l.count(e) / total, 1.0) for e in entities) / len(entities)
+
+
+@pytest.mark.parametrize("entities", CASES)
+def test_regex_backend_matches_per_entity_count(monkeypatch, entities):
+    monkeypatch.setattr(entity_dominance, "ahocorasick", None)
+    assert entity_dominance.multi_entity_dominance(entities, TEXT) == pytest.approx(_expected(entities, TEXT))
+
+
+@pytest.mark.parametrize("entities", CASES)
+def test_automaton_backend_matches_per_entity_count(entities):
+    pytest.importorskip("ahocorasick")
+    assert entity_dominance.multi_entity_dominance(entities, TEXT) == pytest.approx(_expected(entities, TEXT))
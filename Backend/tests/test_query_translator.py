@@ -0,0 +1,44 @@
+import pytest
+
+from app.services.intelli_search import query_translator
+
+
+@pytest.fixture
+def detected(monkeypatch):
+    """Record detection calls; every detected query is reported as French."""
+    calls = []
+
+    def fake_detect(query):
+        calls.append(query)
+        return "fr"
+
+    monkeypatch.setattr(query_translator, "detect_language", fake_detect)
+    monkeypatch.setattr(query_translator, "_get_pipeline", lambda lang: None)
+    query_translator._translate_cached.cache_clear()
+    yield calls
+    query_translator._translate_cached.cache_clear()
+
+
+def test_plain_english_query_skips_detection(detected):
+    result = query_translator.translate_query_if_needed("china infrastructure projects")
+    assert result["detected_language"] == "en"
+    assert result["translated_query"] == "china infrastructure projects"
+    assert detected == []
+
+
+def test_english_with_one_accented_name_skips_detection(detected):
+    result = query_translator.translate_query_if_needed("protests after Macron's speech in Orléans")
+    assert result["detected_language"] == "en"
+    assert detected == []
+
+
+@pytest.mark.parametrize("query", ["guerre en ukraine", "elecciones en mexico", "wahlen und proteste"])
+def test_unaccented_foreign_query_is_detected(detected, query):
+    result = query_translator.translate_query_if_needed(query)
+    assert detected == [query]
+    assert result["detected_language"] == "fr"
+
+
+def test_mostly_non_ascii_query_is_detected(detected):
+    query_translator.translate_query_if_needed("война на украине")
+    assert detected == ["война на украине"]